@@ -19,6 +19,14 @@ class DatabaseSettings(BaseSettings):
     password: str = Field(default="tecdata_pass", env="POSTGRES_PASSWORD")
     url: Optional[str] = Field(default=None, env="DATABASE_URL")
     
+    # Connection pool, sized for several collectors committing at once
+    pool_size: int = Field(default=10, env="DB_POOL_SIZE")
+    max_overflow: int = Field(default=20, env="DB_MAX_OVERFLOW")
+    pool_recycle: int = Field(default=1800, env="DB_POOL_RECYCLE_SECONDS")
+    # Trades durability of the last commits on a server crash for cheaper commits;
+    # collections are idempotent, so a lost batch is simply re-collected
+    synchronous_commit_off: bool = Field(default=False, env="DB_SYNCHRONOUS_COMMIT_OFF")
+    
     class Config:
         extra = "ignore"
     
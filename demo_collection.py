@@ -147,6 +147,7 @@ class MockHTTPClient:
                 self.status_code = 200
                 self.headers = {'content-type': 'application/json'}
                 self.text = json.dumps(data)
+                self.content = self.text.encode()
             
             def json(self):
                 return self._data
@@ -169,7 +170,7 @@ class MockTecmundoCollector(TecmundoCollector):
         # Replace HTTP client with mock
         self.http_client = MockHTTPClient()
     
-    def _initialize_collection(self) -> bool:
+    def _initialize_collection(self, session) -> bool:
         """Mock initialization - skip database operations."""
         logger.info("🏗️  Initializing mock collection (skipping database)")
         
@@ -180,19 +181,27 @@ class MockTecmundoCollector(TecmundoCollector):
                 self.site_id = "tecmundo"
                 self.name = "Tecmundo"
                 self.is_active = True
+            
+            def reset_error_count(self):
+                pass
         
         self._site = MockSite()
         return True
     
-    def _store_enhanced_snapshot(self, data):
+    def _store_enhanced_snapshot(self, session):
         """Mock snapshot storage."""
-        quality = self._calculate_data_quality(data)
-        logger.info(f"📸 [MOCK] Storing snapshot - Quality: {quality['quality_score']:.1f}%")
+        logger.info("📸 [MOCK] Storing snapshot")
+    
+    def _store_data_quality(self, session, snapshot_id):
+        """Mock snapshot quality update."""
+        quality = self._calculate_data_quality()
+        logger.info(f"📸 [MOCK] Snapshot quality: {quality['quality_score']:.1f}%")
         logger.info(f"    Articles found: {quality['articles_found']}")
         logger.info(f"    Articles valid: {quality['articles_valid']}")
     
-    def _process_articles(self, articles_data):
+    def _process_articles(self, session, articles_data, snapshot_id=None):
         """Mock article processing - demonstrate the logic without database."""
+        articles_data = list(articles_data)
         if not articles_data:
             logger.warning("No articles to process")
             return
@@ -232,7 +241,7 @@ class MockTecmundoCollector(TecmundoCollector):
         logger.info(f"    Updated articles: {self.metrics.articles_updated}")
         logger.info(f"    Skipped articles: {self.metrics.articles_skipped}")
     
-    def _update_collection_stats(self):
+    def _update_collection_stats(self, session):
         """Mock stats update."""
         logger.info("📊 [MOCK] Updating collection statistics")
         
@@ -251,7 +260,7 @@ def demo_api_parsing():
         collector = MockTecmundoCollector()
         
         # Test parsing with our mock data
-        articles = collector.parse_response(MOCK_API_RESPONSE)
+        articles = list(collector.parse_response(MOCK_API_RESPONSE))
         
         logger.info(f"✅ Parsed {len(articles)} articles from mock API")
         
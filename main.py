@@ -135,7 +135,7 @@ def validate_data_quality():
                 return True
             
             # Get recent articles
-            recent_articles = article_repo.get_recent_articles(site.id, hours=24)
+            recent_articles = article_repo.get_recent_articles(site.id, hours=24, with_relations=True)
             
             if not recent_articles:
                 logger.warning("No recent articles found")
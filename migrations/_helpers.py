@@ -0,0 +1,55 @@
+"""Shared helpers for Alembic data migrations."""
+
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def backfill_in_batches(
+    connection: Connection,
+    table: str,
+    set_clause: str,
+    where_clause: str,
+    batch_size: int = 1000,
+    sleep_seconds: float = 0.0
+) -> int:
+    """Backfill a large table in small committed batches.
+
+    Each batch updates at most ``batch_size`` rows selected with
+    ``FOR UPDATE SKIP LOCKED`` and is committed on its own, so row locks are
+    short-lived and the collector can keep writing while the backfill runs.
+
+    ``where_clause`` must stop matching a row once ``set_clause`` has been
+    applied to it, otherwise the loop never terminates.
+
+    Inside a migration, run it in an autocommit block so the per-batch commits
+    do not fight Alembic's own transaction::
+
+        with op.get_context().autocommit_block():
+            backfill_in_batches(op.get_bind(), "articles", "slug = ''", "slug IS NULL")
+
+    Returns the total number of rows updated.
+    """
+    statement = text(
+        f"UPDATE {table} SET {set_clause} "
+        f"WHERE id IN ("
+        f"SELECT id FROM {table} WHERE {where_clause} "
+        f"LIMIT :batch_size FOR UPDATE SKIP LOCKED"
+        f")"
+    )
+
+    total_updated = 0
+    while True:
+        result = connection.execute(statement, {"batch_size": batch_size})
+        connection.commit()
+
+        updated = result.rowcount
+        total_updated += updated
+        if updated < batch_size:
+            break
+
+        if sleep_seconds:
+            time.sleep(sleep_seconds)
+
+    return total_updated
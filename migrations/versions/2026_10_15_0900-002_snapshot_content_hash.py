@@ -0,0 +1,27 @@
+"""Add content hash deduplication to snapshots
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('snapshots', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('snapshots', sa.Column('last_seen', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.create_index('uq_snapshot_site_content_hash', 'snapshots', ['site_id', 'content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_snapshot_site_content_hash', table_name='snapshots')
+    op.drop_column('snapshots', 'last_seen')
+    op.drop_column('snapshots', 'content_hash')
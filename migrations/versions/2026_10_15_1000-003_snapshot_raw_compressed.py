@@ -0,0 +1,31 @@
+"""Store snapshot payloads compressed
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('snapshots', sa.Column('raw_compressed', sa.LargeBinary(), nullable=True))
+    op.alter_column('snapshots', 'raw_data',
+               existing_type=sa.JSON(),
+               nullable=True)
+
+
+def downgrade() -> None:
+    # Compressed payloads cannot be decoded in SQL; those rows get an empty placeholder
+    op.execute("UPDATE snapshots SET raw_data = '{}'::json WHERE raw_data IS NULL")
+    op.alter_column('snapshots', 'raw_data',
+               existing_type=sa.JSON(),
+               nullable=False)
+    op.drop_column('snapshots', 'raw_compressed')
@@ -0,0 +1,29 @@
+"""Reference the source snapshot from articles instead of copying raw data
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column('snapshot_id', sa.Integer(), nullable=True))
+    op.add_column('articles', sa.Column('raw_data_hash', sa.String(length=32), nullable=True))
+    op.create_foreign_key('fk_articles_snapshot_id', 'articles', 'snapshots', ['snapshot_id'], ['id'])
+    op.create_index(op.f('ix_articles_snapshot_id'), 'articles', ['snapshot_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_articles_snapshot_id'), table_name='articles')
+    op.drop_constraint('fk_articles_snapshot_id', 'articles', type_='foreignkey')
+    op.drop_column('articles', 'raw_data_hash')
+    op.drop_column('articles', 'snapshot_id')
@@ -0,0 +1,41 @@
+"""Add unique constraint on author name per site
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fold duplicate authors into the oldest row before the constraint is added
+    op.execute(
+        """
+        UPDATE articles SET author_id = keep.id
+        FROM authors dup
+        JOIN (
+            SELECT MIN(id) AS id, name, site_id FROM authors GROUP BY name, site_id
+        ) keep ON keep.name = dup.name AND keep.site_id = dup.site_id
+        WHERE articles.author_id = dup.id AND dup.id <> keep.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM authors dup
+        USING authors keep
+        WHERE keep.name = dup.name AND keep.site_id = dup.site_id AND keep.id < dup.id
+        """
+    )
+    op.create_unique_constraint('uq_author_name_site', 'authors', ['name', 'site_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_author_name_site', 'authors', type_='unique')
@@ -0,0 +1,25 @@
+"""Add partial indexes for significant article history timelines
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_ah_article_sig_time', 'article_history', ['article_id', 'change_timestamp'], unique=False, postgresql_where=sa.text('is_significant'))
+    op.create_index('idx_ah_type_sig_time', 'article_history', ['change_type', 'change_timestamp'], unique=False, postgresql_where=sa.text('is_significant'))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ah_type_sig_time', table_name='article_history')
+    op.drop_index('idx_ah_article_sig_time', table_name='article_history')
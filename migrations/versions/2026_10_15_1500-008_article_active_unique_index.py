@@ -0,0 +1,26 @@
+"""Make article external ID uniqueness apply to live rows only
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('uq_article_active_ext_site', 'articles', ['external_id', 'site_id'], unique=True, postgresql_where=sa.text('NOT is_deleted'))
+    op.drop_constraint('uq_article_external_site', 'articles', type_='unique')
+
+
+def downgrade() -> None:
+    # Fails if a soft-deleted article shares its external ID with a live one
+    op.create_unique_constraint('uq_article_external_site', 'articles', ['external_id', 'site_id'])
+    op.drop_index('uq_article_active_ext_site', table_name='articles')
@@ -0,0 +1,38 @@
+"""Add a materialized 7-day collection stats summary per site
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_collection_stats_summary_7d AS
+        SELECT
+            site_id,
+            SUM(total_requests) AS total_requests,
+            AVG(CASE WHEN total_requests > 0
+                THEN successful_requests::float / total_requests * 100 END) AS avg_success_rate,
+            SUM(total_articles_found) AS total_articles,
+            SUM(new_articles_created) AS total_new_articles,
+            AVG(avg_response_time_ms) FILTER (WHERE avg_response_time_ms IS NOT NULL) AS avg_response_time,
+            AVG(avg_article_quality_score) FILTER (WHERE avg_article_quality_score IS NOT NULL) AS avg_quality_score
+        FROM collection_stats
+        WHERE period_type = 'day' AND period_start >= now() - interval '7 days'
+        GROUP BY site_id
+    """)
+    # Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('uq_mv_collection_stats_summary_7d_site', 'mv_collection_stats_summary_7d', ['site_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_collection_stats_summary_7d")
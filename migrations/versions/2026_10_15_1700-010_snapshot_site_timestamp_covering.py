@@ -0,0 +1,34 @@
+"""Make the snapshot site/timestamp index cover the period aggregates
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# Columns read by CollectionStats period aggregates, stored in the index leaf pages
+INCLUDE_COLUMNS = ['response_status', 'response_time_ms', 'response_size_bytes', 'data_quality_score']
+
+
+def upgrade() -> None:
+    # Build the replacement next to the old index so collectors keep writing
+    with op.get_context().autocommit_block():
+        op.create_index('idx_snapshot_site_timestamp_new', 'snapshots', ['site_id', 'timestamp'],
+                        postgresql_include=INCLUDE_COLUMNS, postgresql_concurrently=True)
+        op.drop_index('idx_snapshot_site_timestamp', table_name='snapshots', postgresql_concurrently=True)
+        op.execute('ALTER INDEX idx_snapshot_site_timestamp_new RENAME TO idx_snapshot_site_timestamp')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('idx_snapshot_site_timestamp_old', 'snapshots', ['site_id', 'timestamp'],
+                        postgresql_concurrently=True)
+        op.drop_index('idx_snapshot_site_timestamp', table_name='snapshots', postgresql_concurrently=True)
+        op.execute('ALTER INDEX idx_snapshot_site_timestamp_old RENAME TO idx_snapshot_site_timestamp')
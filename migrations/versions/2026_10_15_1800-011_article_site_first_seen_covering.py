@@ -0,0 +1,30 @@
+"""Add a covering partial index for live-article period aggregates
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-15 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_articles_site_first_seen_cover', 'articles', ['site_id', 'first_seen'],
+            postgresql_include=['author_id', 'category_id', 'quality_score', 'published_at', 'last_seen', 'is_deleted'],
+            postgresql_where=sa.text('NOT is_deleted'),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_articles_site_first_seen_cover', table_name='articles', postgresql_concurrently=True)
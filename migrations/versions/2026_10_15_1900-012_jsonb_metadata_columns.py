@@ -0,0 +1,40 @@
+"""Store snapshot, site and collection stats JSON columns as JSONB
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-15 19:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+# Each ALTER rewrites its table, so run this in a maintenance window
+COLUMNS = {
+    'snapshots': ['request_headers', 'request_params', 'response_headers', 'raw_data', 'validation_errors'],
+    'sites': ['api_endpoints', 'auth_config'],
+    'collection_stats': ['error_types'],
+}
+
+
+def _alter(column_type: str) -> None:
+    for table, columns in COLUMNS.items():
+        op.execute(
+            f"ALTER TABLE {table} "
+            + ", ".join(
+                f"ALTER COLUMN {column} TYPE {column_type} USING {column}::{column_type}"
+                for column in columns
+            )
+        )
+
+
+def upgrade() -> None:
+    _alter('jsonb')
+
+
+def downgrade() -> None:
+    _alter('json')
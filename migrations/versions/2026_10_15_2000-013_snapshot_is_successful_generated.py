@@ -0,0 +1,31 @@
+"""Add a generated is_successful column and partial index to snapshots
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-15 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table
+    op.add_column('snapshots', sa.Column(
+        'is_successful', sa.Boolean(),
+        sa.Computed('response_status >= 200 AND response_status < 300', persisted=True)
+    ))
+    with op.get_context().autocommit_block():
+        op.create_index('idx_snapshot_site_successful', 'snapshots', ['site_id', 'timestamp'],
+                        postgresql_where=sa.text('is_successful'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_snapshot_site_successful', table_name='snapshots')
+    op.drop_column('snapshots', 'is_successful')
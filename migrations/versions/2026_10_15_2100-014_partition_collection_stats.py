@@ -0,0 +1,107 @@
+"""Partition collection_stats by month on period_start
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-15 21:00:00.000000
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+# Partitions created ahead of the current month; the worker keeps extending them
+MONTHS_AHEAD = 3
+
+SUMMARY_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW mv_collection_stats_summary_7d AS
+    SELECT
+        site_id,
+        SUM(total_requests) AS total_requests,
+        AVG(CASE WHEN total_requests > 0
+            THEN successful_requests::float / total_requests * 100 END) AS avg_success_rate,
+        SUM(total_articles_found) AS total_articles,
+        SUM(new_articles_created) AS total_new_articles,
+        AVG(avg_response_time_ms) FILTER (WHERE avg_response_time_ms IS NOT NULL) AS avg_response_time,
+        AVG(avg_article_quality_score) FILTER (WHERE avg_article_quality_score IS NOT NULL) AS avg_quality_score
+    FROM collection_stats
+    WHERE period_type = 'day' AND period_start >= now() - interval '7 days'
+    GROUP BY site_id
+"""
+
+INDEXES = [
+    ('idx_collection_stats_site_period', ['site_id', 'period_start', 'period_type']),
+    ('idx_collection_stats_period_type', ['period_type', 'period_start']),
+    ('ix_collection_stats_created_at', ['created_at']),
+    ('ix_collection_stats_id', ['id']),
+    ('ix_collection_stats_is_deleted', ['is_deleted']),
+    ('ix_collection_stats_period_end', ['period_end']),
+    ('ix_collection_stats_period_start', ['period_start']),
+    ('ix_collection_stats_period_type', ['period_type']),
+    ('ix_collection_stats_site_id', ['site_id']),
+    ('ix_collection_stats_updated_at', ['updated_at']),
+]
+
+
+def _next_month(month: datetime) -> datetime:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def _swap_table(partitioned: bool) -> None:
+    """Rebuild collection_stats, copying every row, with or without partitioning."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_collection_stats_summary_7d")
+    op.execute("ALTER TABLE collection_stats RENAME TO collection_stats_old")
+    op.execute("ALTER TABLE collection_stats_old RENAME CONSTRAINT collection_stats_pkey TO collection_stats_old_pkey")
+
+    op.execute(
+        "CREATE TABLE collection_stats (LIKE collection_stats_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        + (" PARTITION BY RANGE (period_start)" if partitioned else "")
+    )
+    op.execute(
+        "ALTER TABLE collection_stats ADD CONSTRAINT collection_stats_pkey PRIMARY KEY "
+        + ("(id, period_start)" if partitioned else "(id)")
+    )
+    op.execute("ALTER TABLE collection_stats ADD FOREIGN KEY (site_id) REFERENCES sites (id)")
+    # Keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE collection_stats_id_seq OWNED BY collection_stats.id")
+
+    if partitioned:
+        first_start = op.get_bind().execute(sa.text("SELECT min(period_start) FROM collection_stats_old")).scalar()
+        now = datetime.now(timezone.utc)
+        month = (first_start or now).astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        last = _next_month(now.replace(day=1, hour=0, minute=0, second=0, microsecond=0))
+        for _ in range(MONTHS_AHEAD):
+            last = _next_month(last)
+        while month < last:
+            next_month = _next_month(month)
+            op.execute(
+                f"CREATE TABLE collection_stats_{month:%Y_%m} PARTITION OF collection_stats "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+            )
+            month = next_month
+        op.execute("CREATE TABLE collection_stats_default PARTITION OF collection_stats DEFAULT")
+
+    op.execute("INSERT INTO collection_stats SELECT * FROM collection_stats_old")
+    op.execute("DROP TABLE collection_stats_old")
+
+    for name, columns in INDEXES:
+        op.create_index(name, 'collection_stats', columns)
+
+    op.execute(SUMMARY_VIEW_SQL)
+    op.create_index('uq_mv_collection_stats_summary_7d_site', 'mv_collection_stats_summary_7d', ['site_id'], unique=True)
+
+
+def upgrade() -> None:
+    _swap_table(partitioned=True)
+
+
+def downgrade() -> None:
+    _swap_table(partitioned=False)
@@ -0,0 +1,38 @@
+"""Drop single-column indexes already covered by composite indexes
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-15 22:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+# Each one is the leading column of a composite index (or the partition key)
+COLLECTION_STATS_INDEXES = [
+    ('ix_collection_stats_site_id', 'site_id'),
+    ('ix_collection_stats_period_start', 'period_start'),
+    ('ix_collection_stats_period_type', 'period_type'),
+]
+
+
+def upgrade() -> None:
+    # Partitioned indexes cannot be dropped concurrently; collection_stats is small
+    for name, _ in COLLECTION_STATS_INDEXES:
+        op.drop_index(name, table_name='collection_stats')
+    
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_snapshots_site_id', table_name='snapshots', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_snapshots_site_id', 'snapshots', ['site_id'], postgresql_concurrently=True)
+    
+    for name, column in COLLECTION_STATS_INDEXES:
+        op.create_index(name, 'collection_stats', [column])
@@ -0,0 +1,33 @@
+"""Add generated title token array for duplicate detection
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-15 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column(
+        'title_tokens', postgresql.ARRAY(sa.Text()),
+        sa.Computed(r"regexp_split_to_array(lower(title), '\s+')", persisted=True)
+    ))
+    # Array overlap (&&) prefilter for find_potential_duplicates
+    with op.get_context().autocommit_block():
+        op.create_index('idx_articles_title_tokens', 'articles', ['title_tokens'],
+                        postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_articles_title_tokens', table_name='articles', postgresql_concurrently=True)
+    op.drop_column('articles', 'title_tokens')
@@ -0,0 +1,61 @@
+"""Align the 7-day stats summary view with the other get_stats_summary windows
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+# Days without requests count as 0% success; 0 ms / 0.0 scores mean "no data"
+SUMMARY_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW mv_collection_stats_summary_7d AS
+    SELECT
+        site_id,
+        SUM(total_requests) AS total_requests,
+        AVG(CASE WHEN total_requests > 0
+            THEN successful_requests::float / total_requests * 100 ELSE 0 END) AS avg_success_rate,
+        SUM(total_articles_found) AS total_articles,
+        SUM(new_articles_created) AS total_new_articles,
+        AVG(NULLIF(avg_response_time_ms, 0)) AS avg_response_time,
+        AVG(NULLIF(avg_article_quality_score, 0)) AS avg_quality_score
+    FROM collection_stats
+    WHERE period_type = 'day' AND period_start >= now() - interval '7 days'
+    GROUP BY site_id
+"""
+
+PREVIOUS_SUMMARY_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW mv_collection_stats_summary_7d AS
+    SELECT
+        site_id,
+        SUM(total_requests) AS total_requests,
+        AVG(CASE WHEN total_requests > 0
+            THEN successful_requests::float / total_requests * 100 END) AS avg_success_rate,
+        SUM(total_articles_found) AS total_articles,
+        SUM(new_articles_created) AS total_new_articles,
+        AVG(avg_response_time_ms) FILTER (WHERE avg_response_time_ms IS NOT NULL) AS avg_response_time,
+        AVG(avg_article_quality_score) FILTER (WHERE avg_article_quality_score IS NOT NULL) AS avg_quality_score
+    FROM collection_stats
+    WHERE period_type = 'day' AND period_start >= now() - interval '7 days'
+    GROUP BY site_id
+"""
+
+
+def _recreate_view(view_sql: str) -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_collection_stats_summary_7d")
+    op.execute(view_sql)
+    op.create_index('uq_mv_collection_stats_summary_7d_site', 'mv_collection_stats_summary_7d', ['site_id'], unique=True)
+
+
+def upgrade() -> None:
+    _recreate_view(SUMMARY_VIEW_SQL)
+
+
+def downgrade() -> None:
+    _recreate_view(PREVIOUS_SUMMARY_VIEW_SQL)
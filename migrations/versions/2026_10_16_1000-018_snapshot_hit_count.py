@@ -0,0 +1,37 @@
+"""Count the requests each deduplicated snapshot stands for
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+INCLUDE_COLUMNS = ['response_status', 'response_time_ms', 'response_size_bytes', 'data_quality_score']
+
+
+def _rebuild_site_timestamp_index(include_columns) -> None:
+    # Build the replacement next to the old index so collectors keep writing
+    with op.get_context().autocommit_block():
+        op.create_index('idx_snapshot_site_timestamp_new', 'snapshots', ['site_id', 'timestamp'],
+                        postgresql_include=include_columns, postgresql_concurrently=True)
+        op.drop_index('idx_snapshot_site_timestamp', table_name='snapshots', postgresql_concurrently=True)
+        op.execute('ALTER INDEX idx_snapshot_site_timestamp_new RENAME TO idx_snapshot_site_timestamp')
+
+
+def upgrade() -> None:
+    # Existing rows count once; earlier identical polls were not recorded
+    op.add_column('snapshots', sa.Column('hit_count', sa.Integer(), server_default='1', nullable=False))
+    _rebuild_site_timestamp_index(INCLUDE_COLUMNS + ['hit_count'])
+
+
+def downgrade() -> None:
+    _rebuild_site_timestamp_index(INCLUDE_COLUMNS)
+    op.drop_column('snapshots', 'hit_count')
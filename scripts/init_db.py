@@ -24,18 +24,28 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.models.base import engine, SessionLocal, Base
-from src.models import *  # Import all models to register them
-from src.repositories import *
+from src.repositories.sites import SiteRepository
+from src.repositories.categories import CategoryRepository
+from src.repositories.snapshots import SnapshotRepository
+from src.repositories.articles import ArticleRepository
+from src.repositories.authors import AuthorRepository
+from src.repositories.collection_stats import CollectionStatsRepository
 from config.settings import settings
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _register_models():
+    """Import every model module so Base.metadata knows about all tables."""
+    import src.models  # noqa: F401
+
+
 def drop_all_tables():
     """Drop all tables in the database."""
     logger.info("Dropping all tables...")
     try:
+        _register_models()
         Base.metadata.drop_all(bind=engine)
         logger.info("✓ All tables dropped successfully")
     except Exception as e:
@@ -47,6 +57,7 @@ def create_all_tables():
     """Create all tables using SQLAlchemy metadata."""
     logger.info("Creating all tables...")
     try:
+        _register_models()
         Base.metadata.create_all(bind=engine)
         logger.info("✓ All tables created successfully")
     except Exception as e:
@@ -9,16 +9,34 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from src.utils.logger import get_logger
 from src.utils.database import DatabaseManager
+from src.repositories.sites import SiteRepository
+from src.repositories.articles import ArticleRepository
+from src.repositories.snapshots import SnapshotRepository
 from config.settings import settings
 
 # Initialize logger
 logger = get_logger(__name__)
 
+# Shared HTTP session so repeated health checks reuse pooled TCP/TLS connections
+_HTTP = requests.Session()
+_HTTP.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    )
+)
+
 
 def check_database_health():
     """Check database connection and basic health."""
@@ -51,10 +69,6 @@ def get_collection_stats():
     """Get collection statistics and health."""
     try:
         with DatabaseManager.get_session() as session:
-            from src.repositories.sites import SiteRepository
-            from src.repositories.articles import ArticleRepository
-            from src.repositories.snapshots import SnapshotRepository
-            
             site_repo = SiteRepository(session)
             article_repo = ArticleRepository(session)
             snapshot_repo = SnapshotRepository(session)
@@ -136,10 +150,8 @@ def get_collection_stats():
 def check_api_connectivity():
     """Check if external APIs are accessible."""
     try:
-        import requests
-        
         # Test Tecmundo API
-        response = requests.get(
+        response = _HTTP.get(
             settings.api.tecmundo_full_url,
             timeout=settings.api.request_timeout,
             headers={"User-Agent": "TecData-Monitor/1.0"}
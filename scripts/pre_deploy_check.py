@@ -6,6 +6,8 @@ Run this locally before pushing to Railway to catch issues early.
 
 import sys
 import os
+import importlib.metadata
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to Python path
@@ -13,24 +15,41 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.utils.logger import get_logger
+from config.settings import settings
 
 # Initialize logger
 logger = get_logger(__name__)
 
 
-def check_file_exists(file_path, description):
+class _CheckLog:
+    """Collects one check's log lines so they can be replayed in order."""
+    
+    def __init__(self):
+        self.messages = []
+    
+    def info(self, message):
+        self.messages.append(("INFO", message))
+    
+    def warning(self, message):
+        self.messages.append(("WARNING", message))
+    
+    def error(self, message):
+        self.messages.append(("ERROR", message))
+
+
+def check_file_exists(log, file_path, description):
     """Check if a file exists."""
     if Path(file_path).exists():
-        logger.info(f"✓ {description}: {file_path}")
+        log.info(f"✓ {description}: {file_path}")
         return True
     else:
-        logger.error(f"✗ {description} missing: {file_path}")
+        log.error(f"✗ {description} missing: {file_path}")
         return False
 
 
-def check_dependencies():
+def check_dependencies(log):
     """Check if all required dependencies are installed."""
-    logger.info("Checking Python dependencies...")
+    log.info("Checking Python dependencies...")
     
     required_packages = [
         ("requests", "HTTP requests"),
@@ -45,46 +64,51 @@ def check_dependencies():
         ("uvicorn", "ASGI server"),
     ]
     
+    # One scan of installed distributions instead of probing each package,
+    # with names normalized so "pydantic-settings" matches "pydantic_settings"
+    installed = {
+        dist.metadata['Name'].lower().replace('-', '_')
+        for dist in importlib.metadata.distributions()
+        if dist.metadata['Name']
+    }
+    
+    # psycopg2-binary provides the same "psycopg2" module
+    aliases = {"psycopg2": ("psycopg2", "psycopg2_binary")}
+    
     missing_packages = []
     
     for package, description in required_packages:
-        try:
-            if package == "psycopg2":
-                import psycopg2  # Try the actual package name
-            else:
-                __import__(package)
-            logger.info(f"✓ {description}: {package}")
-        except ImportError:
-            logger.error(f"✗ {description} missing: {package}")
+        if any(name in installed for name in aliases.get(package, (package,))):
+            log.info(f"✓ {description}: {package}")
+        else:
+            log.error(f"✗ {description} missing: {package}")
             missing_packages.append(package)
     
     return len(missing_packages) == 0
 
 
-def check_configuration():
+def check_configuration(log):
     """Check configuration files and settings."""
-    logger.info("Checking configuration...")
+    log.info("Checking configuration...")
     
     try:
-        from config.settings import settings
-        
-        # Check that settings load properly
-        logger.info(f"✓ Settings loaded successfully")
-        logger.info(f"  Environment: {settings.environment}")
-        logger.info(f"  Database configured: {bool(settings.database.url or (settings.database.host and settings.database.database))}")
-        logger.info(f"  API URL: {settings.api.tecmundo_full_url}")
-        logger.info(f"  Collection interval: {settings.collection.interval_hours}h")
+        # Settings are validated once at import (src.utils.logger already needs them)
+        log.info(f"✓ Settings loaded successfully")
+        log.info(f"  Environment: {settings.environment}")
+        log.info(f"  Database configured: {bool(settings.database.url or (settings.database.host and settings.database.database))}")
+        log.info(f"  API URL: {settings.api.tecmundo_full_url}")
+        log.info(f"  Collection interval: {settings.collection.interval_hours}h")
         
         return True
         
     except Exception as e:
-        logger.error(f"✗ Configuration check failed: {e}")
+        log.error(f"✗ Configuration check failed: {e}")
         return False
 
 
-def check_database_models():
+def check_database_models(log):
     """Check that database models can be imported."""
-    logger.info("Checking database models...")
+    log.info("Checking database models...")
     
     try:
         from src.models.sites import Site
@@ -93,32 +117,32 @@ def check_database_models():
         from src.models.categories import Category
         from src.models.snapshots import Snapshot
         
-        logger.info("✓ All database models imported successfully")
+        log.info("✓ All database models imported successfully")
         return True
         
     except Exception as e:
-        logger.error(f"✗ Database model import failed: {e}")
+        log.error(f"✗ Database model import failed: {e}")
         return False
 
 
-def check_collectors():
+def check_collectors(log):
     """Check that data collectors can be imported."""
-    logger.info("Checking data collectors...")
+    log.info("Checking data collectors...")
     
     try:
         from src.collectors.tecmundo import TecmundoCollector
         
-        logger.info("✓ TecmundoCollector imported successfully")
+        log.info("✓ TecmundoCollector imported successfully")
         return True
         
     except Exception as e:
-        logger.error(f"✗ Collector import failed: {e}")
+        log.error(f"✗ Collector import failed: {e}")
         return False
 
 
-def check_repositories():
+def check_repositories(log):
     """Check that repositories can be imported."""
-    logger.info("Checking repositories...")
+    log.info("Checking repositories...")
     
     try:
         from src.repositories.sites import SiteRepository
@@ -127,17 +151,17 @@ def check_repositories():
         from src.repositories.categories import CategoryRepository
         from src.repositories.snapshots import SnapshotRepository
         
-        logger.info("✓ All repositories imported successfully")
+        log.info("✓ All repositories imported successfully")
         return True
         
     except Exception as e:
-        logger.error(f"✗ Repository import failed: {e}")
+        log.error(f"✗ Repository import failed: {e}")
         return False
 
 
-def check_deployment_files():
+def check_deployment_files(log):
     """Check that all deployment files are present."""
-    logger.info("Checking deployment files...")
+    log.info("Checking deployment files...")
     
     deployment_files = [
         ("railway.toml", "Railway configuration"),
@@ -155,46 +179,45 @@ def check_deployment_files():
     
     all_present = True
     for file_path, description in deployment_files:
-        if not check_file_exists(file_path, description):
+        if not check_file_exists(log, file_path, description):
             all_present = False
     
     return all_present
 
 
-def check_alembic_setup():
+def check_alembic_setup(log):
     """Check Alembic migration setup."""
-    logger.info("Checking Alembic setup...")
+    log.info("Checking Alembic setup...")
     
     try:
         # Check alembic.ini exists
         if not Path("alembic.ini").exists():
-            logger.error("✗ alembic.ini not found")
+            log.error("✗ alembic.ini not found")
             return False
         
         # Check migrations directory
         if not Path("migrations").exists():
-            logger.error("✗ migrations directory not found")
+            log.error("✗ migrations directory not found")
             return False
         
         # Check if we can import alembic config
         from alembic.config import Config
         config = Config("alembic.ini")
         
-        logger.info("✓ Alembic configuration valid")
+        log.info("✓ Alembic configuration valid")
         return True
         
     except Exception as e:
-        logger.error(f"✗ Alembic setup check failed: {e}")
+        log.error(f"✗ Alembic setup check failed: {e}")
         return False
 
 
-def check_api_connectivity():
+def check_api_connectivity(log):
     """Check if we can reach the Tecmundo API."""
-    logger.info("Checking API connectivity...")
+    log.info("Checking API connectivity...")
     
     try:
         import requests
-        from config.settings import settings
         
         response = requests.get(
             settings.api.tecmundo_full_url,
@@ -206,20 +229,33 @@ def check_api_connectivity():
             try:
                 data = response.json()
                 posts_count = len(data.get("posts", []))
-                logger.info(f"✓ API reachable - {posts_count} posts available")
+                log.info(f"✓ API reachable - {posts_count} posts available")
                 return True
             except Exception:
-                logger.warning("⚠ API reachable but response format unexpected")
+                log.warning("⚠ API reachable but response format unexpected")
                 return True
         else:
-            logger.warning(f"⚠ API returned status {response.status_code}")
+            log.warning(f"⚠ API returned status {response.status_code}")
             return True  # Not critical for pre-deploy
             
     except Exception as e:
-        logger.warning(f"⚠ API connectivity check failed: {e} (not critical for deploy)")
+        log.warning(f"⚠ API connectivity check failed: {e} (not critical for deploy)")
         return True  # Not critical for pre-deploy
 
 
+def _run_check(check):
+    """Run one named check, reporting crashes instead of raising.
+    
+    Log lines are buffered per check so concurrent checks don't interleave.
+    """
+    _, check_func = check
+    log = _CheckLog()
+    try:
+        return check_func(log), None, log.messages
+    except Exception as e:
+        return False, e, log.messages
+
+
 def main():
     """Main pre-deployment check."""
     logger.info("=" * 60)
@@ -242,20 +278,26 @@ def main():
     total = len(checks)
     critical_failed = False
     
-    for check_name, check_func in checks:
+    # Checks are independent; run them concurrently so the slow API probe
+    # overlaps with the import-based checks instead of adding to them
+    logger.info(f"\nRunning {total} checks concurrently...")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_run_check, checks))
+    
+    for (check_name, _), (ok, error, messages) in zip(checks, results):
         logger.info(f"\nRunning check: {check_name}")
-        logger.info("-" * 40)
+        for level, message in messages:
+            logger.log(level, message)
         
-        try:
-            if check_func():
-                passed += 1
-            else:
-                if check_name in ["Dependencies", "Configuration", "Deployment Files", "Alembic Setup"]:
-                    critical_failed = True
-        except Exception as e:
-            logger.error(f"Check '{check_name}' crashed: {e}")
+        if error is not None:
+            logger.error(f"Check '{check_name}' crashed: {error}")
             if check_name in ["Dependencies", "Configuration", "Deployment Files"]:
                 critical_failed = True
+        elif ok:
+            passed += 1
+        else:
+            if check_name in ["Dependencies", "Configuration", "Deployment Files", "Alembic Setup"]:
+                critical_failed = True
     
     # Summary
     logger.info("\n" + "=" * 60)
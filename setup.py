@@ -94,7 +94,7 @@ def test_api_collection():
             data = response.json()
             
             # Parse the response
-            articles = collector.parse_response(data)
+            articles = list(collector.parse_response(data))
             
             logger.info(f"✓ Successfully parsed {len(articles)} articles")
             
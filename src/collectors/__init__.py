@@ -1,6 +1,6 @@
 """Data collectors package for different tech sites."""
 
-from .base import BaseCollector
+from .base import BaseCollector, collect_concurrently
 from .tecmundo import TecmundoCollector
 
-__all__ = ["BaseCollector", "TecmundoCollector"]
\ No newline at end of file
+__all__ = ["BaseCollector", "TecmundoCollector", "collect_concurrently"]
\ No newline at end of file
@@ -1,33 +1,57 @@
 """Base collector class for data collection from tech sites."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+import asyncio
 import time
-from src.utils.http_client import HTTPClient
+import orjson
+from sqlalchemy import literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from src.utils.http_client import HTTPClient, get_shared_session
 from src.utils.database import DatabaseManager
 from src.utils.logger import get_logger
 from src.models.snapshots import Snapshot
 from src.models.articles import Article
+from src.models.base import utc_now
+from src.repositories.snapshots import SnapshotRepository
 
 logger = get_logger(__name__)
 
+# Parsed-article keys written straight to the articles table by _store_articles
+_ARTICLE_COLUMNS = ('external_id', 'title', 'url', 'summary', 'image_url')
+
 
 class BaseCollector(ABC):
     """Base class for site data collectors."""
     
     def __init__(self, site_id: str):
         self.site_id = site_id
-        self.http_client = HTTPClient()
+        # Rate limiting stays per collector; the connection pool is process-wide
+        self.http_client = HTTPClient(session=get_shared_session())
+        self._api_url = None
+        # Last failure stored as a snapshot, so repeats only bump its counter
+        self._last_error_key = None
+        self._last_error_snapshot_id = None
     
     @abstractmethod
     def get_api_url(self) -> str:
         """Get the API URL for this collector."""
         pass
     
+    @property
+    def api_url(self) -> str:
+        """API URL resolved once per collector instance."""
+        if self._api_url is None:
+            self._api_url = self.get_api_url()
+        return self._api_url
+    
     @abstractmethod
-    def parse_response(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Parse API response into article data."""
+    def parse_response(self, data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Parse API response into article data.
+        
+        May be a generator; callers consume the result once.
+        """
         pass
     
     def collect_data(self) -> bool:
@@ -38,23 +62,30 @@ class BaseCollector(ABC):
             logger.info(f"Starting data collection for {self.site_id}")
             
             # Make API request
-            url = self.get_api_url()
+            url = self.api_url
             response = self.http_client.get(url)
             response_time_ms = int((time.time() - start_time) * 1000)
             
             # Parse JSON response
-            data = response.json()
+            data = orjson.loads(response.content)
             
-            # Store raw snapshot
-            self._store_snapshot(
-                data=data,
-                response_status=response.status_code,
-                response_time_ms=response_time_ms
-            )
+            # Snapshot and articles share one session and are committed together
+            with DatabaseManager.get_session() as session:
+                self._store_snapshot(
+                    session,
+                    raw_content=response.content,
+                    endpoint=url,
+                    response_status=response.status_code,
+                    response_time_ms=response_time_ms,
+                    content_hash=Snapshot.compute_content_hash(response.content)
+                )
+                
+                # Parse and store articles
+                articles_data = self.parse_response(data)
+                stored_count = self._store_articles(session, articles_data)
             
-            # Parse and store articles
-            articles_data = self.parse_response(data)
-            stored_count = self._store_articles(articles_data)
+            self._last_error_key = None
+            self._last_error_snapshot_id = None
             
             logger.info(
                 f"Collection completed for {self.site_id}: "
@@ -67,74 +98,104 @@ class BaseCollector(ABC):
             response_time_ms = int((time.time() - start_time) * 1000)
             logger.error(f"Collection failed for {self.site_id}: {e}")
             
-            # Store failed snapshot
-            self._store_snapshot(
-                data={},
-                response_status=0,
-                response_time_ms=response_time_ms,
-                error_message=str(e)
-            )
+            # Store failed snapshot, or count a repeat of the previous failure
+            error_key = (type(e).__name__, str(e)[:200])
+            try:
+                with DatabaseManager.get_session() as session:
+                    if error_key == self._last_error_key and self._last_error_snapshot_id:
+                        SnapshotRepository(session).record_repeated_error(self._last_error_snapshot_id)
+                    else:
+                        self._last_error_snapshot_id = self._store_snapshot(
+                            session,
+                            raw_content=b'{}',
+                            endpoint=self.api_url,
+                            response_status=0,
+                            response_time_ms=response_time_ms,
+                            error_message=str(e)
+                        )
+                        self._last_error_key = error_key
+            except Exception as session_error:
+                logger.error(f"Failed to store failed snapshot: {session_error}")
             
             return False
     
+    async def collect_data_async(self) -> bool:
+        """Run collect_data in a worker thread so several sites can be fetched concurrently."""
+        return await asyncio.to_thread(self.collect_data)
+    
     def _store_snapshot(
         self,
-        data: Dict[str, Any],
+        session: Session,
+        raw_content: bytes,
+        endpoint: str,
         response_status: int,
         response_time_ms: int,
-        error_message: Optional[str] = None
-    ):
-        """Store raw API snapshot."""
+        error_message: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> Optional[int]:
+        """Store raw API snapshot, skipping the payload write when content is unchanged.
+        
+        Returns the snapshot ID, or None if it could not be stored.
+        """
         try:
-            with DatabaseManager.get_session() as session:
-                snapshot = Snapshot(
+            # Savepoint so a failed snapshot does not roll back the article writes
+            with session.begin_nested():
+                snapshot_id = SnapshotRepository(session).upsert_by_content_hash(
                     site_id=self.site_id,
-                    endpoint=self.get_api_url(),
-                    raw_data=data,
+                    endpoint=endpoint,
+                    raw_compressed=Snapshot.compress_raw_body(raw_content),
                     response_status=response_status,
                     response_time_ms=response_time_ms,
-                    error_message=error_message
+                    error_message=error_message,
+                    content_hash=content_hash
                 )
-                session.add(snapshot)
-                session.commit()
-                logger.debug(f"Snapshot stored with ID: {snapshot.id}")
+            logger.debug("Snapshot stored with ID: {}", snapshot_id)
+            return snapshot_id
         except Exception as e:
             logger.error(f"Failed to store snapshot: {e}")
+            return None
     
-    def _store_articles(self, articles_data: List[Dict[str, Any]]) -> int:
-        """Store parsed articles."""
+    def _store_articles(self, session: Session, articles_data: Iterable[Dict[str, Any]]) -> int:
+        """Store parsed articles with a single upsert, returning the number of new rows."""
         stored_count = 0
         
+        # One timestamp for the whole batch; setting it on every row keeps the
+        # VALUES rows uniform instead of evaluating the column defaults per row
+        now = utc_now()
+        
+        # ON CONFLICT cannot touch the same row twice in one statement
+        rows_by_id = {}
+        site_id = self.site_id
+        for article_data in articles_data:
+            row = {column: article_data.get(column) for column in _ARTICLE_COLUMNS}
+            row['site_id'] = site_id
+            row['first_seen'] = row['last_seen'] = row['created_at'] = row['updated_at'] = now
+            if row['title'] is None:
+                row['title'] = ''
+            rows_by_id[row['external_id']] = row
+        
+        if not rows_by_id:
+            return stored_count
+        
         try:
-            with DatabaseManager.get_session() as session:
-                for article_data in articles_data:
-                    # Check if article already exists
-                    existing = session.query(Article).filter_by(
-                        external_id=article_data.get('external_id'),
-                        site_id=self.site_id
-                    ).first()
-                    
-                    if existing:
-                        # Update last_seen timestamp
-                        existing.last_seen = datetime.utcnow()
-                        logger.debug(f"Updated article: {existing.title[:50]}")
-                    else:
-                        # Create new article
-                        article = Article(
-                            external_id=article_data.get('external_id'),
-                            site_id=self.site_id,
-                            title=article_data.get('title', ''),
-                            author=article_data.get('author'),
-                            category=article_data.get('category'),
-                            url=article_data.get('url'),
-                            summary=article_data.get('summary'),
-                            image_url=article_data.get('image_url')
-                        )
-                        session.add(article)
-                        stored_count += 1
-                        logger.debug(f"Stored new article: {article.title[:50]}")
+            with session.begin_nested():
+                # Existence check, insert and last_seen touch in one statement;
+                # xmax = 0 only for rows that were freshly inserted
+                stmt = pg_insert(Article).values(list(rows_by_id.values()))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['external_id', 'site_id'],
+                    index_where=text('NOT is_deleted'),
+                    set_={'last_seen': now}
+                ).returning(literal_column('xmax = 0').label('inserted'))
+                
+                results = session.execute(stmt).scalars().all()
+                stored_count = sum(1 for inserted in results if inserted)
                 
-                session.commit()
+                # Arguments are only formatted when a DEBUG handler is active
+                logger.debug(
+                    "Upserted {} articles ({} new, {} touched)",
+                    len(results), stored_count, len(results) - stored_count
+                )
                 
         except Exception as e:
             logger.error(f"Failed to store articles: {e}")
@@ -145,4 +206,9 @@ class BaseCollector(ABC):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.http_client.close()
\ No newline at end of file
+        self.http_client.close()
+
+
+async def collect_concurrently(collectors: Sequence[BaseCollector]) -> List[bool]:
+    """Collect from several sites at once; total latency is bounded by the slowest site."""
+    return await asyncio.gather(*(collector.collect_data_async() for collector in collectors))
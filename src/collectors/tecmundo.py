@@ -1,11 +1,16 @@
 """Tecmundo API collector implementation with comprehensive data parsing and persistence."""
 
+import re
 import time
-from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timezone
-from dataclasses import dataclass
 from urllib.parse import urlparse, urljoin
 
+import orjson
+from sqlalchemy.orm import Session
+
 from config.settings import settings
 from .base import BaseCollector
 from src.utils.logger import get_logger
@@ -16,25 +21,168 @@ from src.repositories.authors import AuthorRepository
 from src.repositories.categories import CategoryRepository
 from src.repositories.snapshots import SnapshotRepository
 from src.repositories.collection_stats import CollectionStatsRepository
+from src.models.snapshots import Snapshot
+from src.models.articles import Article
 
 logger = get_logger(__name__)
 
+# Compiled once; used for every parsed article
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\b\w+\b')
+# Image extension at the end of the URL, or an image indicator anywhere in it
+_IMAGE_URL_RE = re.compile(r'\.(?:jpe?g|png|gif|webp|svg)\Z|image|img|photo|pic|thumb', re.IGNORECASE)
+
+# Candidate post keys for each article field, in priority order
+_FIELD_SPEC = {
+    'external_id': ('id', 'post_id', 'ID', 'guid', 'slug', 'permalink', 'url'),
+    'title': ('title', 'post_title', 'name', 'headline', 'subject'),
+    'author': (
+        'author', 'post_author', 'author_name', 'by', 'created_by',
+        'writer', 'journalist', 'redator'
+    ),
+    'category': (
+        'category', 'categories', 'tag', 'tags', 'section', 'channel',
+        'topic', 'subject', 'type', 'content_type'
+    ),
+    'url': ('url', 'link', 'permalink', 'guid', 'href'),
+    'summary': (
+        'summary', 'excerpt', 'description', 'content', 'lead',
+        'subtitle', 'abstract', 'preview'
+    ),
+    'image_url': (
+        'image', 'featured_image', 'thumbnail', 'cover_image', 'picture',
+        'photo', 'media', 'featured_media'
+    ),
+    'published_at': (
+        'published_at', 'date', 'created_at', 'publication_date',
+        'post_date', 'publish_date', 'timestamp'
+    ),
+    'word_count': ('content', 'body', 'text', 'summary', 'excerpt'),
+}
+
+# Article columns read while diffing existing articles: the change hashes
+# plus every column _build_article_fields and the update path compare
+_DIFF_COLUMNS = (
+    Article.external_id, Article.raw_data_hash, Article.content_hash, Article.last_seen,
+    Article.title, Article.summary, Article.url, Article.image_url,
+    Article.author_id, Article.category_id, Article.word_count, Article.quality_score
+)
+
+# Keys tried, per field, when the matched post value is itself an object
+_OBJECT_KEYS = {
+    'title': ('rendered', 'raw', 'plain', 'value'),
+    'author': ('name', 'display_name', 'nickname', 'login'),
+    'category': ('name', 'title', 'label', 'slug'),
+    'image_url': ('url', 'src', 'source_url', 'link', 'href'),
+}
+
+# Response keys that may hold the posts list
+_POSTS_LIST_KEYS = ('posts', 'articles', 'data', 'items', 'results', 'content')
+
+# External ID fields whose value is a URL; the ID is its last path segment
+_URL_ID_FIELDS = frozenset(('url', 'permalink', 'guid'))
+
+# Keys tried when a post value is a nested object or a list of objects
+_NESTED_VALUE_KEYS = ('rendered', 'raw', 'value', 'name', 'title', 'plain')
+_LIST_ITEM_KEYS = ('name', 'title', 'value', 'label')
+
+
+def _extract_value(value: Any) -> Optional[str]:
+    """Reduce a raw post value (scalar, nested object or list) to a non-empty string."""
+    # Exact type checks: parsed JSON only holds builtin types, and plain
+    # strings are by far the most common value
+    value_type = type(value)
+    if value_type is str:
+        return value.strip() or None
+    
+    if value_type is dict:
+        # Try common nested keys
+        for nested_key in _NESTED_VALUE_KEYS:
+            nested = value.get(nested_key)
+            if nested:
+                result = str(nested).strip()
+                if result:
+                    return result
+    elif value_type is list:
+        # Take first non-empty item from list
+        for item in value:
+            if type(item) is dict:
+                for key in _LIST_ITEM_KEYS:
+                    nested = item.get(key)
+                    if nested:
+                        result = str(nested).strip()
+                        if result:
+                            return result
+            elif item:
+                result = str(item).strip()
+                if result:
+                    return result
+    elif value:
+        return str(value).strip() or None
+    
+    return None
+
+
+# Non-ISO formats tried before falling back to dateutil (RFC 822, as used in feeds)
+_DATE_FORMATS = (
+    '%a, %d %b %Y %H:%M:%S %z',
+)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(value: str) -> Optional[datetime]:
+    """Parse a date string, trying the fast stdlib parsers before dateutil.
+    
+    Cached: every poll of the feed returns mostly the same posts and dates.
+    """
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    
+    try:
+        from dateutil.parser import parse
+        return parse(value)
+    except Exception:
+        return None
+
 
-@dataclass
 class CollectionMetrics:
     """Metrics for a collection run."""
-    start_time: datetime
-    end_time: Optional[datetime] = None
-    articles_found: int = 0
-    articles_new: int = 0
-    articles_updated: int = 0
-    articles_skipped: int = 0
-    errors: List[str] = None
-    response_time_ms: int = 0
-    
-    def __post_init__(self):
-        if self.errors is None:
-            self.errors = []
+    
+    __slots__ = (
+        'start_time', 'end_time', 'articles_found', 'articles_valid', 'articles_new',
+        'articles_updated', 'articles_skipped', 'errors', 'response_time_ms'
+    )
+    
+    def __init__(
+        self,
+        start_time: datetime,
+        end_time: Optional[datetime] = None,
+        articles_found: int = 0,
+        articles_valid: int = 0,
+        articles_new: int = 0,
+        articles_updated: int = 0,
+        articles_skipped: int = 0,
+        errors: Optional[List[str]] = None,
+        response_time_ms: int = 0
+    ):
+        self.start_time = start_time
+        self.end_time = end_time
+        self.articles_found = articles_found
+        self.articles_valid = articles_valid
+        self.articles_new = articles_new
+        self.articles_updated = articles_updated
+        self.articles_skipped = articles_skipped
+        self.errors = errors if errors is not None else []
+        self.response_time_ms = response_time_ms
     
     def duration_seconds(self) -> float:
         if self.end_time:
@@ -52,6 +200,9 @@ class TecmundoCollector(BaseCollector):
         super().__init__(site_id=self.SITE_ID)
         self.metrics = None
         self._site = None
+        self._site_pk = None
+        self._content_hash = None
+        self._raw_content = None
         
     def get_api_url(self) -> str:
         """Get Tecmundo API URL."""
@@ -64,24 +215,38 @@ class TecmundoCollector(BaseCollector):
         try:
             logger.info(f"Starting enhanced data collection for {self.site_id}")
             
-            # Initialize repositories and site
-            if not self._initialize_collection():
-                return False
-            
-            # Make API request with detailed timing
-            response_data = self._fetch_data()
-            if not response_data:
-                return False
-            
-            # Store raw snapshot first
-            self._store_enhanced_snapshot(response_data)
-            
-            # Parse and process articles
-            articles_data = self.parse_response(response_data)
-            self._process_articles(articles_data)
-            
-            # Update collection statistics
-            self._update_collection_stats()
+            # All phases share one session and are committed together
+            with DatabaseManager.get_session() as session:
+                # The API request does not depend on the site row, so it runs
+                # while the site is loaded instead of after it
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    fetch = executor.submit(self._fetch_data)
+                    
+                    # Initialize repositories and site
+                    if not self._initialize_collection(session):
+                        fetch.cancel()
+                        return False
+                    
+                    # Make API request with detailed timing
+                    response_data = fetch.result()
+                
+                if not response_data:
+                    return False
+                
+                # Store raw snapshot before the articles that reference it
+                snapshot_id = self._store_enhanced_snapshot(session)
+                
+                # Parsed articles stream straight into processing
+                self._process_articles(session, self.parse_response(response_data), snapshot_id)
+                
+                # The parse pass has now counted valid posts for the snapshot's quality score
+                self._store_data_quality(session, snapshot_id)
+                
+                # Update collection statistics
+                self._update_collection_stats(session)
+                
+                # Site status rides on the same commit as the collected data
+                self._site.reset_error_count()
             
             self.metrics.end_time = datetime.now(timezone.utc)
             
@@ -97,36 +262,37 @@ class TecmundoCollector(BaseCollector):
             self._handle_collection_error(e)
             return False
     
-    def _initialize_collection(self) -> bool:
-        """Initialize database session and ensure site exists."""
+    def _initialize_collection(self, session: Session) -> bool:
+        """Ensure the site exists and is active."""
         try:
-            with DatabaseManager.get_session() as session:
-                site_repo = SiteRepository(session)
-                
-                # Get or create site
-                self._site = site_repo.get_by_site_id(self.SITE_ID)
-                if not self._site:
-                    logger.info(f"Creating new site record for {self.SITE_ID}")
-                    self._site = site_repo.create_site(
-                        name="Tecmundo",
-                        site_id=self.SITE_ID,
-                        base_url=self.BASE_URL,
-                        api_endpoints={
-                            "posts": settings.api.tecmundo_endpoint
-                        },
-                        description="Portal de tecnologia brasileiro",
-                        category="technology",
-                        country="BR",
-                        language="pt-BR"
-                    )
-                    session.commit()
-                
-                if not self._site.is_active:
-                    logger.warning(f"Site {self.SITE_ID} is inactive, skipping collection")
-                    return False
-                
-                return True
-                
+            site_repo = SiteRepository(session)
+            
+            # Get or create site
+            self._site = site_repo.get_by_site_id(self.SITE_ID)
+            if not self._site:
+                logger.info(f"Creating new site record for {self.SITE_ID}")
+                self._site = site_repo.create_site(
+                    name="Tecmundo",
+                    site_id=self.SITE_ID,
+                    base_url=self.BASE_URL,
+                    api_endpoints={
+                        "posts": settings.api.tecmundo_endpoint
+                    },
+                    description="Portal de tecnologia brasileiro",
+                    category="technology",
+                    country="BR",
+                    language="pt-BR"
+                )
+            
+            if not self._site.is_active:
+                logger.warning(f"Site {self.SITE_ID} is inactive, skipping collection")
+                return False
+            
+            # Plain integer for the snapshot, article and stats foreign keys
+            self._site_pk = self._site.id
+            
+            return True
+            
         except Exception as e:
             logger.error(f"Failed to initialize collection: {e}")
             return False
@@ -134,12 +300,15 @@ class TecmundoCollector(BaseCollector):
     def _fetch_data(self) -> Optional[Dict[str, Any]]:
         """Fetch data from API with enhanced error handling and metrics."""
         try:
-            url = self.get_api_url()
-            logger.debug(f"Fetching data from: {url}")
+            url = self.api_url
+            logger.debug("Fetching data from: {}", url)
             
             start_time = time.time()
             response = self.http_client.get(url)
             self.metrics.response_time_ms = int((time.time() - start_time) * 1000)
+            self._content_hash = Snapshot.compute_content_hash(response.content)
+            # Kept so the snapshot stores the body without re-serializing the parsed dict
+            self._raw_content = response.content
             
             # Validate response
             if response.status_code != 200:
@@ -150,10 +319,11 @@ class TecmundoCollector(BaseCollector):
             
             # Parse JSON
             try:
-                data = response.json()
-                logger.debug(f"Successfully parsed JSON response ({len(str(data))} chars)")
+                data = orjson.loads(response.content)
+                # Body size is already known; formatted only if DEBUG is enabled
+                logger.debug("Successfully parsed JSON response ({} bytes)", len(response.content))
                 return data
-            except ValueError as e:
+            except orjson.JSONDecodeError as e:
                 error_msg = f"Invalid JSON response: {e}"
                 self.metrics.errors.append(error_msg)
                 logger.error(error_msg)
@@ -165,105 +335,102 @@ class TecmundoCollector(BaseCollector):
             logger.error(error_msg)
             return None
     
-    def _store_enhanced_snapshot(self, data: Dict[str, Any]):
-        """Store snapshot with enhanced metadata."""
+    def _store_enhanced_snapshot(self, session: Session) -> Optional[int]:
+        """Store snapshot with enhanced metadata, returning its ID."""
         try:
-            with DatabaseManager.get_session() as session:
+            # Savepoint so a failed snapshot does not abort the collection transaction
+            with session.begin_nested():
                 snapshot_repo = SnapshotRepository(session)
                 
-                # Calculate data quality metrics
-                quality_metrics = self._calculate_data_quality(data)
-                
-                snapshot = snapshot_repo.create(
-                    site_id=self._site.site_id,
-                    endpoint=self.get_api_url(),
-                    raw_data=data,
+                snapshot_id = snapshot_repo.upsert_by_content_hash(
+                    site_id=self._site_pk,
+                    endpoint=self.api_url,
+                    raw_compressed=Snapshot.compress_raw_body(self._raw_content),
                     response_status=200,
                     response_time_ms=self.metrics.response_time_ms,
-                    articles_found=quality_metrics.get('articles_found', 0),
-                    articles_valid=quality_metrics.get('articles_valid', 0),
-                    data_quality_score=quality_metrics.get('quality_score', 0.0)
+                    content_hash=self._content_hash
                 )
-                session.commit()
-                logger.debug(f"Stored snapshot with ID: {snapshot.id}")
+            logger.debug("Stored snapshot with ID: {}", snapshot_id)
+            return snapshot_id
                 
         except Exception as e:
             logger.error(f"Failed to store enhanced snapshot: {e}")
+            return None
     
-    def _calculate_data_quality(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate data quality metrics from raw API response."""
+    def _store_data_quality(self, session: Session, snapshot_id: Optional[int]) -> None:
+        """Write the finished parse's quality score onto the snapshot with one UPDATE."""
+        if snapshot_id is None:
+            return
+        
+        quality_metrics = self._calculate_data_quality()
         try:
-            articles = self._extract_articles_list(data)
-            articles_found = len(articles)
-            
-            if articles_found == 0:
-                return {
-                    'articles_found': 0,
-                    'articles_valid': 0,
-                    'quality_score': 0.0
-                }
-            
-            # Count articles with required fields
-            valid_articles = 0
-            for article in articles:
-                if self._has_required_fields(article):
-                    valid_articles += 1
-            
-            quality_score = (valid_articles / articles_found) * 100
-            
+            with session.begin_nested():
+                SnapshotRepository(session).set_data_quality_score(snapshot_id, quality_metrics['quality_score'])
+        except Exception as e:
+            logger.error(f"Failed to store snapshot quality score: {e}")
+    
+    def _calculate_data_quality(self) -> Dict[str, Any]:
+        """Summarize data quality from the parse that just ran."""
+        articles_found = self.metrics.articles_found
+        articles_valid = self.metrics.articles_valid
+        
+        if articles_found == 0:
             return {
-                'articles_found': articles_found,
-                'articles_valid': valid_articles,
-                'quality_score': round(quality_score, 2)
+                'articles_found': 0,
+                'articles_valid': 0,
+                'quality_score': 0.0
             }
-            
-        except Exception as e:
-            logger.error(f"Failed to calculate data quality: {e}")
-            return {'articles_found': 0, 'articles_valid': 0, 'quality_score': 0.0}
-    
-    def _has_required_fields(self, article: Dict[str, Any]) -> bool:
-        """Check if article has minimum required fields."""
-        required_fields = ['id', 'title']
-        for field in required_fields:
-            if not self._extract_field(article, [field]):
-                return False
-        return True
+        
+        quality_score = (articles_valid / articles_found) * 100
+        
+        return {
+            'articles_found': articles_found,
+            'articles_valid': articles_valid,
+            'quality_score': round(quality_score, 2)
+        }
     
-    def parse_response(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Enhanced parsing with better error handling and data validation."""
-        articles = []
+    def parse_response(self, data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Enhanced parsing with better error handling and data validation.
+        
+        Articles are yielded as they are parsed so they can be persisted
+        without building the full list first; valid posts are counted in
+        ``metrics.articles_valid`` once the generator is exhausted.
+        """
+        parsed_count = 0
         
         try:
             posts = self._extract_articles_list(data)
-            self.metrics.articles_found = len(posts)
-            
-            logger.debug(f"Found {len(posts)} posts in response")
-            
-            for i, post in enumerate(posts):
-                try:
-                    article_data = self._parse_single_post(post)
-                    if article_data:
-                        articles.append(article_data)
-                    else:
-                        self.metrics.articles_skipped += 1
-                        
-                except Exception as e:
-                    error_msg = f"Failed to parse post {i}: {e}"
-                    logger.warning(error_msg)
-                    self.metrics.errors.append(error_msg)
-                    self.metrics.articles_skipped += 1
-            
-            logger.info(f"Successfully parsed {len(articles)} articles from {len(posts)} posts")
-            
         except Exception as e:
             error_msg = f"Failed to parse Tecmundo response: {e}"
             logger.error(error_msg)
             self.metrics.errors.append(error_msg)
             
             if isinstance(data, dict):
-                logger.debug(f"Available keys: {list(data.keys())[:10]}")
+                logger.opt(lazy=True).debug("Available keys: {}", lambda: list(data.keys())[:10])
+            return
+        
+        self.metrics.articles_found = len(posts)
+        
+        logger.debug("Found {} posts in response", len(posts))
+        
+        for i, post in enumerate(posts):
+            try:
+                article_data = self._parse_single_post(post)
+            except Exception as e:
+                error_msg = f"Failed to parse post {i}: {e}"
+                logger.warning(error_msg)
+                self.metrics.errors.append(error_msg)
+                self.metrics.articles_skipped += 1
+                continue
+            
+            if article_data:
+                parsed_count += 1
+                yield article_data
+            else:
+                self.metrics.articles_skipped += 1
         
-        return articles
+        self.metrics.articles_valid = parsed_count
+        logger.info(f"Successfully parsed {parsed_count} articles from {len(posts)} posts")
     
     def _extract_articles_list(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract articles list from various possible response structures."""
@@ -271,7 +438,7 @@ class TecmundoCollector(BaseCollector):
             return data
         elif isinstance(data, dict):
             # Try common keys for posts/articles
-            for key in ['posts', 'articles', 'data', 'items', 'results', 'content']:
+            for key in _POSTS_LIST_KEYS:
                 if key in data and isinstance(data[key], list):
                     return data[key]
             
@@ -300,7 +467,7 @@ class TecmundoCollector(BaseCollector):
             # Extract title with better handling
             title = self._extract_title(post)
             if not title:
-                logger.debug(f"No title found for post {external_id}, skipping")
+                logger.debug("No title found for post {}, skipping", external_id)
                 return None
             
             # Extract other fields with enhanced logic
@@ -314,13 +481,14 @@ class TecmundoCollector(BaseCollector):
                 'image_url': self._extract_image_url(post),
                 'published_at': self._extract_published_date(post),
                 'word_count': self._estimate_word_count(post),
-                'raw_data': post  # Store original for debugging
+                # The post itself stays in the snapshot; keep only its fingerprint
+                'raw_data_hash': Article.compute_raw_data_hash(post)
             }
             
             # Validate and normalize URL
             article_data['url'] = self._normalize_url(article_data['url'])
             
-            logger.debug(f"Parsed article: {title[:50]}...")
+            logger.debug("Parsed article: {:.50}...", title)
             return article_data
             
         except Exception as e:
@@ -329,16 +497,14 @@ class TecmundoCollector(BaseCollector):
     
     def _extract_external_id(self, post: Dict[str, Any]) -> Optional[str]:
         """Extract external ID with comprehensive field checking."""
-        id_fields = ['id', 'post_id', 'ID', 'guid', 'slug', 'permalink', 'url']
-        
-        for field in id_fields:
-            value = self._extract_field(post, [field])
+        for field in _FIELD_SPEC['external_id']:
+            value = _extract_value(post.get(field))
             if value:
                 # Clean and validate ID
                 clean_id = str(value).strip()
                 if clean_id:
                     # Extract ID from URL if necessary
-                    if field in ['url', 'permalink', 'guid'] and '/' in clean_id:
+                    if field in _URL_ID_FIELDS and '/' in clean_id:
                         url_parts = clean_id.rstrip('/').split('/')
                         clean_id = url_parts[-1] if url_parts[-1] else url_parts[-2]
                     return clean_id
@@ -346,15 +512,13 @@ class TecmundoCollector(BaseCollector):
     
     def _extract_title(self, post: Dict[str, Any]) -> Optional[str]:
         """Extract title with better nested object handling."""
-        title_fields = ['title', 'post_title', 'name', 'headline', 'subject']
-        
-        for field in title_fields:
+        for field in _FIELD_SPEC['title']:
             if field in post:
                 value = post[field]
                 
                 if isinstance(value, dict):
                     # Handle WordPress-style nested objects
-                    for key in ['rendered', 'raw', 'plain', 'value']:
+                    for key in _OBJECT_KEYS['title']:
                         if key in value and value[key]:
                             return str(value[key]).strip()
                 elif isinstance(value, str) and value.strip():
@@ -366,18 +530,13 @@ class TecmundoCollector(BaseCollector):
     
     def _extract_author(self, post: Dict[str, Any]) -> Optional[str]:
         """Extract author with enhanced field checking."""
-        author_fields = [
-            'author', 'post_author', 'author_name', 'by', 'created_by',
-            'writer', 'journalist', 'redator'
-        ]
-        
-        for field in author_fields:
-            value = self._extract_field(post, [field])
+        for field in _FIELD_SPEC['author']:
+            value = _extract_value(post.get(field))
             if value:
                 # Handle author objects
                 if isinstance(post.get(field), dict):
                     author_obj = post[field]
-                    for key in ['name', 'display_name', 'nickname', 'login']:
+                    for key in _OBJECT_KEYS['author']:
                         if key in author_obj and author_obj[key]:
                             return str(author_obj[key]).strip()
                 return str(value).strip()
@@ -386,13 +545,8 @@ class TecmundoCollector(BaseCollector):
     
     def _extract_category(self, post: Dict[str, Any]) -> Optional[str]:
         """Extract category with comprehensive field mapping."""
-        category_fields = [
-            'category', 'categories', 'tag', 'tags', 'section', 'channel',
-            'topic', 'subject', 'type', 'content_type'
-        ]
-        
-        for field in category_fields:
-            value = self._extract_field(post, [field])
+        for field in _FIELD_SPEC['category']:
+            value = _extract_value(post.get(field))
             if value:
                 # Handle category arrays or objects
                 if isinstance(post.get(field), list) and post[field]:
@@ -402,7 +556,7 @@ class TecmundoCollector(BaseCollector):
                     return str(first_cat).strip()
                 elif isinstance(post.get(field), dict):
                     cat_obj = post[field]
-                    for key in ['name', 'title', 'label', 'slug']:
+                    for key in _OBJECT_KEYS['category']:
                         if key in cat_obj and cat_obj[key]:
                             return str(cat_obj[key]).strip()
                 return str(value).strip()
@@ -411,10 +565,8 @@ class TecmundoCollector(BaseCollector):
     
     def _extract_url(self, post: Dict[str, Any]) -> Optional[str]:
         """Extract URL with validation and normalization."""
-        url_fields = ['url', 'link', 'permalink', 'guid', 'href']
-        
-        for field in url_fields:
-            value = self._extract_field(post, [field])
+        for field in _FIELD_SPEC['url']:
+            value = _extract_value(post.get(field))
             if value:
                 url = str(value).strip()
                 if url.startswith(('http://', 'https://')):
@@ -426,19 +578,13 @@ class TecmundoCollector(BaseCollector):
     
     def _extract_summary(self, post: Dict[str, Any]) -> Optional[str]:
         """Extract summary/excerpt with length limits."""
-        summary_fields = [
-            'summary', 'excerpt', 'description', 'content', 'lead',
-            'subtitle', 'abstract', 'preview'
-        ]
-        
-        for field in summary_fields:
-            value = self._extract_field(post, [field])
+        for field in _FIELD_SPEC['summary']:
+            value = _extract_value(post.get(field))
             if value:
                 summary = str(value).strip()
                 # Clean HTML tags if present
-                import re
-                summary = re.sub(r'<[^>]+>', '', summary)
-                summary = re.sub(r'\s+', ' ', summary).strip()
+                summary = _HTML_TAG_RE.sub('', summary)
+                summary = _WS_RE.sub(' ', summary).strip()
                 
                 if len(summary) > 10:  # Minimum meaningful length
                     return self._clean_text(summary, max_length=1000)
@@ -447,17 +593,12 @@ class TecmundoCollector(BaseCollector):
     
     def _extract_image_url(self, post: Dict[str, Any]) -> Optional[str]:
         """Extract image URL with comprehensive field checking."""
-        image_fields = [
-            'image', 'featured_image', 'thumbnail', 'cover_image', 'picture',
-            'photo', 'media', 'featured_media'
-        ]
-        
-        for field in image_fields:
-            value = self._extract_field(post, [field])
+        for field in _FIELD_SPEC['image_url']:
+            value = _extract_value(post.get(field))
             if value:
                 if isinstance(post.get(field), dict):
                     img_obj = post[field]
-                    for key in ['url', 'src', 'source_url', 'link', 'href']:
+                    for key in _OBJECT_KEYS['image_url']:
                         if key in img_obj and img_obj[key]:
                             url = str(img_obj[key]).strip()
                             if self._is_valid_image_url(url):
@@ -471,36 +612,26 @@ class TecmundoCollector(BaseCollector):
     
     def _extract_published_date(self, post: Dict[str, Any]) -> Optional[datetime]:
         """Extract published date with various format handling."""
-        date_fields = [
-            'published_at', 'date', 'created_at', 'publication_date',
-            'post_date', 'publish_date', 'timestamp'
-        ]
-        
-        for field in date_fields:
-            value = self._extract_field(post, [field])
+        for field in _FIELD_SPEC['published_at']:
+            value = _extract_value(post.get(field))
             if value:
-                try:
-                    # Handle different date formats
-                    from dateutil.parser import parse
-                    return parse(str(value))
-                except:
-                    continue
+                # Handle different date formats
+                published_at = _parse_date(str(value))
+                if published_at:
+                    return published_at
         
         # Fallback to current time if no date found
         return datetime.now(timezone.utc)
     
     def _estimate_word_count(self, post: Dict[str, Any]) -> Optional[int]:
         """Estimate word count from available content."""
-        content_fields = ['content', 'body', 'text', 'summary', 'excerpt']
-        
         total_words = 0
-        for field in content_fields:
-            value = self._extract_field(post, [field])
+        for field in _FIELD_SPEC['word_count']:
+            value = _extract_value(post.get(field))
             if value:
                 # Simple word count estimation
-                import re
-                text = re.sub(r'<[^>]+>', '', str(value))  # Remove HTML
-                words = len(re.findall(r'\b\w+\b', text))
+                text = _HTML_TAG_RE.sub('', str(value))  # Remove HTML
+                words = len(_WORD_RE.findall(text))
                 total_words += words
         
         return total_words if total_words > 0 else None
@@ -510,20 +641,8 @@ class TecmundoCollector(BaseCollector):
         if not url or not isinstance(url, str):
             return False
         
-        # Check for image extensions
-        image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg']
-        url_lower = url.lower()
-        
-        # Direct extension check
-        if any(url_lower.endswith(ext) for ext in image_extensions):
-            return True
-        
-        # Check for image indicators in URL
-        image_indicators = ['image', 'img', 'photo', 'pic', 'thumb']
-        if any(indicator in url_lower for indicator in image_indicators):
-            return True
-        
-        return False
+        # One pass over the URL for both the extension and the indicator checks
+        return _IMAGE_URL_RE.search(url) is not None
     
     def _normalize_url(self, url: Optional[str]) -> Optional[str]:
         """Normalize URL to absolute form."""
@@ -560,126 +679,125 @@ class TecmundoCollector(BaseCollector):
         
         return text
     
-    def _process_articles(self, articles_data: List[Dict[str, Any]]):
-        """Process parsed articles with comprehensive persistence logic."""
-        if not articles_data:
+    def _process_articles(
+        self,
+        session: Session,
+        articles_data: Iterable[Dict[str, Any]],
+        snapshot_id: Optional[int] = None
+    ):
+        """Process parsed articles with a fixed number of queries per batch."""
+        # Later duplicates of an external ID win, as they did when processed one by one
+        articles_by_id = {article_data['external_id']: article_data for article_data in articles_data}
+        
+        if not articles_by_id:
             logger.warning("No articles to process")
             return
         
         try:
-            with DatabaseManager.get_session() as session:
+            # Savepoint so a failed batch leaves the snapshot and stats intact
+            with session.begin_nested():
                 # Initialize repositories
                 article_repo = ArticleRepository(session)
                 author_repo = AuthorRepository(session)
                 category_repo = CategoryRepository(session)
                 
-                for article_data in articles_data:
+                site_id = self._site_pk
+                # One last_seen timestamp for the whole batch
+                now = datetime.now(timezone.utc)
+                
+                # Resolve existing articles, authors and categories up front
+                existing_articles = article_repo.find_by_external_ids(
+                    articles_by_id.keys(), site_id, load_columns=_DIFF_COLUMNS
+                )
+                author_ids = author_repo.get_or_create_many(
+                    {a['author'] for a in articles_by_id.values() if a.get('author')}, site_id
+                )
+                category_ids = category_repo.get_or_create_many(
+                    {a['category'] for a in articles_by_id.values() if a.get('category')}, site_id
+                )
+                
+                to_insert = []
+                to_update = []
+                unchanged_ids = []
+                
+                for external_id, article_data in articles_by_id.items():
                     try:
-                        self._process_single_article(
-                            article_data, article_repo, author_repo, category_repo
-                        )
+                        existing_article = existing_articles.get(external_id)
+                        raw_data_hash = article_data.get('raw_data_hash')
+                        
+                        if existing_article is not None and existing_article.raw_data_hash == raw_data_hash:
+                            # Same source post, so no derived field can have changed
+                            unchanged_ids.append(existing_article.id)
+                            continue
+                        
+                        fields = self._build_article_fields(article_data, author_ids, category_ids)
+                        content_hash = Article.compute_content_hash(fields)
+                        
+                        if existing_article is None:
+                            to_insert.append({
+                                'external_id': external_id,
+                                'site_id': site_id,
+                                'published_at': article_data.get('published_at'),
+                                'snapshot_id': snapshot_id,
+                                'raw_data_hash': raw_data_hash,
+                                'content_hash': content_hash,
+                                **fields
+                            })
+                            continue
+                        
+                        if existing_article.content_hash == content_hash:
+                            # Just update last_seen
+                            unchanged_ids.append(existing_article.id)
+                        else:
+                            to_update.append((
+                                existing_article,
+                                {'last_seen': now, **fields}
+                            ))
+                        
+                        # Bookkeeping columns are set directly so they get no history records
+                        existing_article.raw_data_hash = raw_data_hash
+                        existing_article.content_hash = content_hash
+                        existing_article.snapshot_id = snapshot_id
                     except Exception as e:
-                        error_msg = f"Failed to process article {article_data.get('external_id')}: {e}"
+                        error_msg = f"Failed to process article {external_id}: {e}"
                         logger.error(error_msg)
                         self.metrics.errors.append(error_msg)
                         self.metrics.articles_skipped += 1
                 
-                # Commit all changes
-                session.commit()
-                logger.info(
-                    f"Processed {self.metrics.articles_new} new and "
-                    f"{self.metrics.articles_updated} updated articles"
-                )
+                article_repo.bulk_create_articles(to_insert)
+                self.metrics.articles_new += len(to_insert)
+                
+                article_repo.bulk_update_with_history(to_update, change_source='collection')
+                self.metrics.articles_updated += len(to_update)
                 
+                article_repo.touch_last_seen(unchanged_ids, now)
+            
+            logger.info(
+                f"Processed {self.metrics.articles_new} new and "
+                f"{self.metrics.articles_updated} updated articles"
+            )
+            
         except Exception as e:
             logger.error(f"Failed to process articles: {e}")
             self.metrics.errors.append(f"Article processing failed: {e}")
     
-    def _process_single_article(
+    def _build_article_fields(
         self,
         article_data: Dict[str, Any],
-        article_repo: ArticleRepository,
-        author_repo: AuthorRepository,
-        category_repo: CategoryRepository
-    ):
-        """Process a single article with full normalization and relationship handling."""
-        
-        # Check if article already exists
-        existing_article = article_repo.find_by_external_id(
-            article_data['external_id'], self._site.id
-        )
-        
-        # Get or create author
-        author_id = None
-        if article_data.get('author'):
-            author = author_repo.get_or_create_by_name_and_site(
-                article_data['author'], self._site.id
-            )
-            author_id = author.id
-        
-        # Get or create category
-        category_id = None
-        if article_data.get('category'):
-            category = category_repo.get_or_create_by_name_and_site(
-                article_data['category'], self._site.id
-            )
-            category_id = category.id
-        
-        # Calculate quality score
-        quality_score = self._calculate_article_quality(article_data)
-        
-        if existing_article:
-            # Update existing article
-            updates = {
-                'last_seen': datetime.now(timezone.utc),
-                'title': article_data['title'],
-                'summary': article_data.get('summary'),
-                'url': article_data.get('url'),
-                'image_url': article_data.get('image_url'),
-                'author_id': author_id,
-                'category_id': category_id,
-                'word_count': article_data.get('word_count'),
-                'quality_score': quality_score,
-                'raw_data': article_data.get('raw_data')
-            }
-            
-            # Only update if there are actual changes
-            has_changes = False
-            for field, new_value in updates.items():
-                if field == 'last_seen':  # Always update last_seen
-                    has_changes = True
-                    continue
-                current_value = getattr(existing_article, field)
-                if current_value != new_value:
-                    has_changes = True
-                    break
-            
-            if has_changes:
-                article_repo.update_article_with_history(
-                    existing_article.id, updates, change_source='collection'
-                )
-                self.metrics.articles_updated += 1
-            else:
-                # Just update last_seen
-                existing_article.update_last_seen()
-                
-        else:
-            # Create new article
-            article = article_repo.create_article(
-                external_id=article_data['external_id'],
-                site_id=self._site.id,
-                title=article_data['title'],
-                url=article_data.get('url'),
-                summary=article_data.get('summary'),
-                image_url=article_data.get('image_url'),
-                author_id=author_id,
-                category_id=category_id,
-                published_at=article_data.get('published_at'),
-                word_count=article_data.get('word_count'),
-                quality_score=quality_score,
-                raw_data=article_data.get('raw_data')
-            )
-            self.metrics.articles_new += 1
+        author_ids: Dict[str, int],
+        category_ids: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """Build the article columns that are refreshed on every collection."""
+        return {
+            'title': article_data['title'],
+            'summary': article_data.get('summary'),
+            'url': article_data.get('url'),
+            'image_url': article_data.get('image_url'),
+            'author_id': author_ids.get(article_data.get('author')),
+            'category_id': category_ids.get(article_data.get('category')),
+            'word_count': article_data.get('word_count'),
+            'quality_score': self._calculate_article_quality(article_data)
+        }
     
     def _calculate_article_quality(self, article_data: Dict[str, Any]) -> float:
         """Calculate quality score for an article based on available data."""
@@ -711,15 +829,15 @@ class TecmundoCollector(BaseCollector):
         
         return min(score, 100.0)  # Cap at 100
     
-    def _update_collection_stats(self):
+    def _update_collection_stats(self, session: Session):
         """Update collection statistics for monitoring and analysis."""
         try:
-            with DatabaseManager.get_session() as session:
+            with session.begin_nested():
                 stats_repo = CollectionStatsRepository(session)
                 
                 # Create collection stats record
                 stats_repo.create(
-                    site_id=self._site.site_id,
+                    site_id=self._site_pk,
                     collection_date=self.metrics.start_time.date(),
                     articles_found=self.metrics.articles_found,
                     articles_new=self.metrics.articles_new,
@@ -730,10 +848,9 @@ class TecmundoCollector(BaseCollector):
                     error_count=len(self.metrics.errors),
                     errors=self.metrics.errors if self.metrics.errors else None
                 )
-                
-                session.commit()
-                logger.debug("Updated collection statistics")
-                
+            
+            logger.debug("Updated collection statistics")
+            
         except Exception as e:
             logger.error(f"Failed to update collection stats: {e}")
     
@@ -745,48 +862,22 @@ class TecmundoCollector(BaseCollector):
         
         logger.error(error_msg)
         
-        # Update site error count
+        # Update site error count in its own short transaction
         try:
             with DatabaseManager.get_session() as session:
                 site_repo = SiteRepository(session)
                 site_repo.update_collection_status(
                     self.SITE_ID, success=False, error_message=str(error)
                 )
-                session.commit()
         except Exception as e:
             logger.error(f"Failed to update site status: {e}")
     
-    def _extract_field(self, post: Dict[str, Any], field_names: List[str]) -> Optional[str]:
+    def _extract_field(self, post: Dict[str, Any], field_names: Iterable[str]) -> Optional[str]:
         """Enhanced field extraction with better type handling."""
         for field_name in field_names:
-            if field_name in post:
-                value = post[field_name]
-                
-                # Handle different value types
-                if isinstance(value, dict):
-                    # Try common nested keys
-                    for nested_key in ['rendered', 'raw', 'value', 'name', 'title', 'plain']:
-                        if nested_key in value and value[nested_key]:
-                            result = str(value[nested_key]).strip()
-                            if result:
-                                return result
-                elif isinstance(value, list) and value:
-                    # Take first non-empty item from list
-                    for item in value:
-                        if isinstance(item, dict):
-                            for key in ['name', 'title', 'value', 'label']:
-                                if key in item and item[key]:
-                                    result = str(item[key]).strip()
-                                    if result:
-                                        return result
-                        elif item:
-                            result = str(item).strip()
-                            if result:
-                                return result
-                elif value:
-                    result = str(value).strip()
-                    if result:
-                        return result
+            result = _extract_value(post.get(field_name))
+            if result:
+                return result
         
         return None
     
@@ -1,9 +1,49 @@
 """Article history model for tracking changes over time."""
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, ForeignKey, Index, Float
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Optional
+from datetime import timedelta
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, ForeignKey, Index, Float, insert, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, utc_now
+
+# Change type recorded for each tracked article field (read-only)
+_CHANGE_TYPE_BY_FIELD = MappingProxyType({
+    'title': 'content',
+    'summary': 'content', 
+    'content_excerpt': 'content',
+    'author_id': 'metadata',
+    'category_id': 'metadata',
+    'published_at': 'metadata',
+    'image_url': 'media',
+    'images': 'media',
+    'tags': 'analysis',
+    'keywords': 'analysis',
+    'topics': 'analysis',
+    'url': 'reference',
+    'canonical_url': 'reference'
+})
+
+# Fields whose changes are always tracked as significant
+_ALWAYS_SIGNIFICANT_FIELDS = frozenset(('title', 'author_id', 'category_id', 'published_at', 'url'))
+
+# Text fields where only a substantial length change is significant
+_TEXT_FIELDS = frozenset(('summary', 'content_excerpt'))
+
+
+class ChangePayload:
+    """A pending field change, accumulated before a bulk history insert."""
+    
+    __slots__ = ('article_id', 'field_name', 'old_value', 'new_value', 'change_source')
+    
+    def __init__(self, article_id: int, field_name: str, old_value, new_value,
+                 change_source: str = 'collection'):
+        self.article_id = article_id
+        self.field_name = field_name
+        self.old_value = old_value
+        self.new_value = new_value
+        self.change_source = change_source
 
 
 class ArticleHistory(Base):
@@ -21,7 +61,7 @@ class ArticleHistory(Base):
     new_value = Column(Text, nullable=True)  # New value
     
     # Change metadata
-    change_timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    change_timestamp = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), index=True)
     change_source = Column(String(100), nullable=False)  # 'collection', 'manual_edit', 'batch_update'
     change_reason = Column(String(200), nullable=True)  # Optional reason for change
     
@@ -37,6 +77,11 @@ class ArticleHistory(Base):
     __table_args__ = (
         Index('idx_article_history_article_timestamp', 'article_id', 'change_timestamp'),
         Index('idx_article_history_type_timestamp', 'change_type', 'change_timestamp'),
+        # Significant-only timelines read just the rows they return
+        Index('idx_ah_article_sig_time', 'article_id', 'change_timestamp',
+              postgresql_where=text('is_significant')),
+        Index('idx_ah_type_sig_time', 'change_type', 'change_timestamp',
+              postgresql_where=text('is_significant')),
     )
     
     # Relationships
@@ -47,97 +92,125 @@ class ArticleHistory(Base):
         return f"<ArticleHistory(id={self.id}, article_id={self.article_id}, type='{self.change_type}', field='{self.field_name}')>"
     
     @classmethod
-    def create_change_record(cls, session, article_id: int, field_name: str, old_value, new_value, 
-                           change_source: str = 'collection', **kwargs):
-        """Create a new change record for an article field."""
+    def build_change_row(cls, article_id: int, field_name: str, old_value, new_value,
+                         change_source: str = 'collection', **kwargs) -> Dict[str, Any]:
+        """Build the column values of a change record for an article field."""
         
         # Determine change type based on field name
-        change_type_mapping = {
-            'title': 'content',
-            'summary': 'content', 
-            'content_excerpt': 'content',
-            'author_id': 'metadata',
-            'category_id': 'metadata',
-            'published_at': 'metadata',
-            'image_url': 'media',
-            'images': 'media',
-            'tags': 'analysis',
-            'keywords': 'analysis',
-            'topics': 'analysis',
-            'url': 'reference',
-            'canonical_url': 'reference'
-        }
-        
-        change_type = change_type_mapping.get(field_name, 'other')
-        
-        # Determine if change is significant
-        is_significant = cls._is_change_significant(field_name, old_value, new_value)
+        change_type = _CHANGE_TYPE_BY_FIELD.get(field_name, 'other')
         
-        # Convert values to strings for storage
+        # Convert values to strings once, for storage and the significance check
         old_str = str(old_value) if old_value is not None else None
         new_str = str(new_value) if new_value is not None else None
         
-        history_record = cls(
-            article_id=article_id,
-            change_type=change_type,
-            field_name=field_name,
-            old_value=old_str,
-            new_value=new_str,
-            change_source=change_source,
-            is_significant=is_significant,
+        # Determine if change is significant
+        is_significant = cls._is_change_significant(field_name, old_str, new_str)
+        
+        return {
+            'article_id': article_id,
+            'change_type': change_type,
+            'field_name': field_name,
+            'old_value': old_str,
+            'new_value': new_str,
+            'change_source': change_source,
+            'is_significant': is_significant,
             **kwargs
-        )
+        }
+    
+    @classmethod
+    def create_change_record(cls, session, article_id: int, field_name: str, old_value, new_value, 
+                           change_source: str = 'collection', **kwargs):
+        """Create a new change record for an article field.
+        
+        Returns None without touching the session when the values are equal.
+        """
+        if old_value is new_value or old_value == new_value:
+            return None
+        
+        history_record = cls(**cls.build_change_row(
+            article_id, field_name, old_value, new_value, change_source, **kwargs
+        ))
         
         session.add(history_record)
         return history_record
     
+    @classmethod
+    def bulk_create_change_records(cls, session, changes: Iterable[ChangePayload]) -> int:
+        """Insert many change records with one executemany, bypassing the unit of work.
+        
+        Changes whose values are equal are skipped before any string conversion.
+        Returns the number of records inserted.
+        """
+        # One client-side timestamp for the batch instead of a default call per row
+        now = utc_now()
+        rows = [
+            cls.build_change_row(
+                change.article_id, change.field_name,
+                change.old_value, change.new_value, change.change_source,
+                change_timestamp=now, created_at=now, updated_at=now
+            )
+            for change in changes
+            if change.old_value != change.new_value
+        ]
+        if rows:
+            session.execute(insert(cls), rows)
+        return len(rows)
+    
     @staticmethod
-    def _is_change_significant(field_name: str, old_value, new_value) -> bool:
-        """Determine if a change is significant enough to track."""
+    def _is_change_significant(field_name: str, old_str: Optional[str], new_str: Optional[str]) -> bool:
+        """Determine if a change is significant enough to track.
+        
+        Takes the stored string forms of the values, so nothing is stringified twice.
+        """
         
         # Always track these fields
-        significant_fields = {'title', 'author_id', 'category_id', 'published_at', 'url'}
-        if field_name in significant_fields:
+        if field_name in _ALWAYS_SIGNIFICANT_FIELDS:
             return True
         
+        if old_str == new_str:
+            return False
+        
         # For text fields, check if change is substantial
-        if field_name in {'summary', 'content_excerpt'}:
-            if not old_value or not new_value:
+        if field_name in _TEXT_FIELDS:
+            if not old_str or not new_str:
                 return True
             
             # Simple heuristic: significant if more than 10% different
-            old_len = len(str(old_value))
-            new_len = len(str(new_value))
-            if old_len == 0:
-                return new_len > 0
-            
-            length_diff = abs(old_len - new_len) / old_len
+            old_len = len(old_str)
+            length_diff = abs(old_len - len(new_str)) / old_len
             return length_diff > 0.1
         
         # For other fields, any change is significant
-        return old_value != new_value
+        return True
     
     @classmethod
-    def get_article_timeline(cls, session, article_id: int, limit: int = 50):
+    def get_article_timeline(cls, session, article_id: int, limit: int = 50,
+                             significant_only: bool = False):
         """Get timeline of changes for an article."""
-        return session.query(cls).filter_by(
-            article_id=article_id
-        ).order_by(
+        query = session.query(cls).filter_by(article_id=article_id)
+        
+        if significant_only:
+            query = query.filter(cls.is_significant == True)
+        
+        return query.order_by(
             cls.change_timestamp.desc()
         ).limit(limit).all()
     
     @classmethod
-    def get_recent_changes(cls, session, hours: int = 24, change_types: list = None):
+    def get_recent_changes(cls, session, hours: int = 24, change_types: list = None,
+                           significant_only: bool = False):
         """Get recent changes across all articles."""
-        from datetime import datetime, timedelta
-        
+        # Cutoff on the database clock, consistent with change_timestamp's default
         query = session.query(cls).filter(
-            cls.change_timestamp >= datetime.utcnow() - timedelta(hours=hours)
+            cls.change_timestamp >= func.now() - timedelta(hours=hours)
         )
         
         if change_types:
             query = query.filter(cls.change_type.in_(change_types))
         
+        if significant_only:
+            query = query.filter(cls.is_significant == True)
+        
         return query.order_by(cls.change_timestamp.desc()).all()
     
     def get_summary(self) -> str:
@@ -1,9 +1,29 @@
 """Article model for storing processed article data."""
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, ForeignKey, UniqueConstraint, Index, Float
-from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
-from .base import Base
+import hashlib
+import re
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+import orjson
+from sqlalchemy import Column, Computed, Integer, String, DateTime, Text, Boolean, JSON, ForeignKey, Index, Float, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import func, text
+from sqlalchemy.orm import deferred, relationship
+from .base import Base, utc_now
+
+# title_tokens splits on this Postgres regex; title_tokens_of() must use the same expression
+TITLE_TOKEN_SEPARATOR = r'\s+'
+
+# Collected columns covered by Article.content_hash, in hashing order
+_CONTENT_HASH_FIELDS = (
+    'title', 'url', 'summary', 'image_url', 'author_id',
+    'category_id', 'word_count', 'quality_score'
+)
+
+# Slug cleanup: leading/trailing slash and .htm(l) suffix, then any run of
+# characters other than letters, digits and underscores (hyphens included)
+_SLUG_STRIP_RE = re.compile(r'^/|/$|\.html?$')
+_SLUG_SEPARATOR_RE = re.compile(r'[^a-zA-Z0-9_]+')
 
 
 class Article(Base):
@@ -21,6 +41,8 @@ class Article(Base):
     
     # Article content
     title = Column(String(500), nullable=False, index=True)
+    # Lowercased title words, kept by Postgres for the duplicate-detection prefilter
+    title_tokens = deferred(Column(ARRAY(Text), Computed(f"regexp_split_to_array(lower(title), '{TITLE_TOKEN_SEPARATOR}')", persisted=True)))
     slug = Column(String(500), nullable=True, index=True)  # URL-friendly version
     summary = Column(Text, nullable=True)
     content_excerpt = Column(Text, nullable=True)  # First few paragraphs
@@ -29,7 +51,7 @@ class Article(Base):
     url = Column(Text, nullable=False)
     canonical_url = Column(Text, nullable=True)  # For duplicate detection
     image_url = Column(Text, nullable=True)
-    images = Column(JSON, nullable=True)  # Additional images
+    images = deferred(Column(JSON, nullable=True), group='media')  # Additional images
     
     # Article metadata
     published_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Original publish date
@@ -37,15 +59,15 @@ class Article(Base):
     reading_time_minutes = Column(Integer, nullable=True)
     language = Column(String(10), default='pt-BR', nullable=False)
     
-    # Content analysis (for future NLP processing)
+    # Content analysis (for future NLP processing); large JSON blobs load on first access
     tags = Column(JSON, nullable=True)  # Extracted tags
-    keywords = Column(JSON, nullable=True)  # Extracted keywords
+    keywords = deferred(Column(JSON, nullable=True), group='analysis')  # Extracted keywords
     sentiment_score = Column(Float, nullable=True)  # -1 to 1
-    topics = Column(JSON, nullable=True)  # AI-extracted topics
+    topics = deferred(Column(JSON, nullable=True), group='analysis')  # AI-extracted topics
     
     # Tracking timestamps
-    first_seen = Column(DateTime(timezone=True), server_default=func.now(), index=True)
-    last_seen = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
+    first_seen = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), index=True)
+    last_seen = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), onupdate=func.now(), index=True)
     last_updated = Column(DateTime(timezone=True), nullable=True)  # When content was last updated
     
     # Status and quality
@@ -55,15 +77,25 @@ class Article(Base):
     quality_score = Column(Float, default=0.0, nullable=False)  # Content quality 0-100
     
     # Collection metadata
-    collection_errors = Column(JSON, nullable=True)  # Track any collection issues
-    raw_data = Column(JSON, nullable=True)  # Original data from API for debugging
+    collection_errors = deferred(Column(JSON, nullable=True), group='diagnostics')  # Track any collection issues
+    raw_data = deferred(Column(JSON, nullable=True), group='raw')  # Legacy; the source post now lives in the snapshot
+    snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=True, index=True)  # Snapshot holding the source post
+    raw_data_hash = Column(String(32), nullable=True)  # Hash of the source post, see compute_raw_data_hash
+    content_hash = Column(String(16), nullable=True)  # Hash of the collected columns, see compute_content_hash
     
     # Table constraints
     __table_args__ = (
-        UniqueConstraint('external_id', 'site_id', name='uq_article_external_site'),
+        # Unique among live rows only; lookups always filter out soft-deleted articles
+        Index('uq_article_active_ext_site', 'external_id', 'site_id', unique=True,
+              postgresql_where=text('NOT is_deleted')),
         Index('idx_article_site_published', 'site_id', 'published_at'),
         Index('idx_article_site_first_seen', 'site_id', 'first_seen'),
+        # Index-only scans for the CollectionStats period aggregates over live articles
+        Index('idx_articles_site_first_seen_cover', 'site_id', 'first_seen',
+              postgresql_include=['author_id', 'category_id', 'quality_score', 'published_at', 'last_seen', 'is_deleted'],
+              postgresql_where=text('NOT is_deleted')),
         Index('idx_article_active_published', 'is_active', 'published_at'),
+        Index('idx_articles_title_tokens', 'title_tokens', postgresql_using='gin'),
     )
     
     # Relationships
@@ -77,6 +109,22 @@ class Article(Base):
     def __repr__(self):
         return f"<Article(id={self.id}, title='{self.title[:50]}...', site_id={self.site_id})>"
     
+    @staticmethod
+    def title_tokens_of(title: str):
+        """SQL expression tokenizing a title exactly like the title_tokens column."""
+        return func.regexp_split_to_array(func.lower(literal(title, Text)), TITLE_TOKEN_SEPARATOR)
+    
+    @staticmethod
+    def compute_raw_data_hash(post: Dict[str, Any]) -> str:
+        """Hash a source post independently of its key order."""
+        return hashlib.blake2b(orjson.dumps(post, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def compute_content_hash(fields: Dict[str, Any]) -> str:
+        """Hash the collected columns so an unchanged article is detected with one compare."""
+        normalized = '\x1f'.join(str(fields.get(field)) for field in _CONTENT_HASH_FIELDS)
+        return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+    
     @classmethod
     def find_by_external_id(cls, session, external_id: str, site_id: int):
         """Find article by external ID and site."""
@@ -92,27 +140,52 @@ class Article(Base):
         self.duplicate_of_id = original_article_id
         self.is_active = False
     
+    @classmethod
+    def mark_duplicates(cls, session, pairs: Iterable[Tuple[int, int]]) -> int:
+        """Mark many articles as duplicates with one executemany UPDATE by primary key.
+        
+        ``pairs`` holds ``(duplicate_id, original_id)`` tuples. Returns the number of rows sent.
+        """
+        rows = [
+            {'id': duplicate_id, 'is_duplicate': True, 'duplicate_of_id': original_id, 'is_active': False}
+            for duplicate_id, original_id in pairs
+        ]
+        if rows:
+            session.execute(update(cls), rows)
+        return len(rows)
+    
+    @staticmethod
+    def reading_time_for(word_count: Optional[int]) -> Optional[int]:
+        """Estimate reading time based on word count (250 words per minute)."""
+        if word_count:
+            return max(1, round(word_count / 250))
+        return None
+    
     def calculate_reading_time(self):
         """Estimate reading time based on word count (250 words per minute)."""
         if self.word_count:
-            self.reading_time_minutes = max(1, round(self.word_count / 250))
+            self.reading_time_minutes = Article.reading_time_for(self.word_count)
     
     def update_last_seen(self):
         """Update the last_seen timestamp to now."""
         from datetime import datetime
         self.last_seen = datetime.utcnow()
     
+    @staticmethod
+    def slug_from_url(url: Optional[str]) -> Optional[str]:
+        """Extract a slug from an article URL."""
+        if not url:
+            return None
+        
+        # Simple slug extraction from URL
+        path = urlparse(url).path
+        # Remove leading/trailing slashes and file extensions
+        slug = _SLUG_STRIP_RE.sub('', path)
+        # Replace special characters with hyphens, one per run
+        slug = _SLUG_SEPARATOR_RE.sub('-', slug)
+        return slug[:500] if slug else None
+    
     def extract_slug_from_url(self):
         """Extract a slug from the article URL."""
         if self.url:
-            # Simple slug extraction from URL
-            import re
-            from urllib.parse import urlparse
-            path = urlparse(self.url).path
-            # Remove leading/trailing slashes and file extensions
-            slug = re.sub(r'^/|/$|\.html?$', '', path)
-            # Replace special characters with hyphens
-            slug = re.sub(r'[^a-zA-Z0-9\-_]', '-', slug)
-            # Remove multiple consecutive hyphens
-            slug = re.sub(r'-+', '-', slug)
-            self.slug = slug[:500] if slug else None
\ No newline at end of file
+            self.slug = Article.slug_from_url(self.url)
\ No newline at end of file
@@ -1,12 +1,13 @@
 """Author model for managing article authors."""
 
-from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey, DateTime
+from typing import Optional
+from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey, DateTime, UniqueConstraint, select, update
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, NamedPerSiteMixin
 
 
-class Author(Base):
+class Author(NamedPerSiteMixin, Base):
     """Model for storing author information across sites."""
     
     __tablename__ = "authors"
@@ -35,6 +36,10 @@ class Author(Base):
     first_article_date = Column(DateTime(timezone=True), nullable=True)
     last_article_date = Column(DateTime(timezone=True), nullable=True)
     
+    __table_args__ = (
+        UniqueConstraint('name', 'site_id', name='uq_author_name_site'),
+    )
+    
     # Relationships
     site = relationship("Site", back_populates="authors")
     articles = relationship("Article", back_populates="author")
@@ -56,16 +61,60 @@ class Author(Base):
         """Update author statistics based on their articles."""
         from .articles import Article
         
-        articles_query = session.query(Article).filter_by(
-            author_id=self.id,
-            is_deleted=False
-        )
+        # Count and date range in one pass over the author's articles
+        total, first_seen, last_seen = session.execute(
+            select(
+                func.count(),
+                func.min(Article.first_seen),
+                func.max(Article.last_seen)
+            ).where(Article.author_id == self.id, Article.is_deleted == False)
+        ).one()
+        
+        self.total_articles = total
+        
+        if total > 0:
+            self.first_article_date = first_seen
+            self.last_article_date = last_seen
+    
+    @classmethod
+    def refresh_stats_bulk(cls, session, site_id: Optional[int] = None) -> int:
+        """Recompute update_article_stats for every author in two statements.
+        
+        One GROUP BY over the articles, then one executemany UPDATE by primary
+        key. Authors without articles get a zero count and keep their dates.
+        Returns the number of authors updated.
+        """
+        from .articles import Article
+        
+        article_filter = [Article.is_deleted == False]
+        if site_id:
+            article_filter.append(Article.site_id == site_id)
+        
+        stats = select(
+            Article.author_id,
+            func.count().label('total'),
+            func.min(Article.first_seen).label('first_seen'),
+            func.max(Article.last_seen).label('last_seen')
+        ).where(*article_filter).group_by(Article.author_id).subquery()
+        
+        query = select(
+            cls.id, cls.first_article_date, cls.last_article_date,
+            stats.c.total, stats.c.first_seen, stats.c.last_seen
+        ).outerjoin(stats, stats.c.author_id == cls.id).where(cls.is_deleted == False)
+        if site_id:
+            query = query.where(cls.site_id == site_id)
         
-        self.total_articles = articles_query.count()
+        rows = [
+            {
+                'id': author_id,
+                'total_articles': total or 0,
+                'first_article_date': first_seen if total else first_article_date,
+                'last_article_date': last_seen if total else last_article_date
+            }
+            for author_id, first_article_date, last_article_date, total, first_seen, last_seen
+            in session.execute(query)
+        ]
         
-        if self.total_articles > 0:
-            first_article = articles_query.order_by(Article.first_seen.asc()).first()
-            last_article = articles_query.order_by(Article.last_seen.desc()).first()
-            
-            self.first_article_date = first_article.first_seen
-            self.last_article_date = last_article.last_seen
\ No newline at end of file
+        if rows:
+            session.execute(update(cls), rows)
+        return len(rows)
\ No newline at end of file
@@ -1,19 +1,38 @@
 """Base model configuration for SQLAlchemy 2.0+."""
 
-from datetime import datetime
-from typing import Any
-from sqlalchemy import Column, DateTime, create_engine, Boolean
-from sqlalchemy.ext.declarative import as_declarative, declared_attr
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Tuple
+import orjson
+from sqlalchemy import Column, DateTime, create_engine, Boolean, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.declarative import as_declarative
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import func
 from config.settings import settings
 
+
+def _json_dumps(value: Any) -> str:
+    """Serialize JSON column values with orjson's C encoder."""
+    return orjson.dumps(value).decode()
+
+
 # Create the SQLAlchemy engine
 engine = create_engine(
     settings.database.url,
     echo=settings.debug,
+    pool_size=settings.database.pool_size,
+    max_overflow=settings.database.max_overflow,
+    pool_use_lifo=True,  # Reuse the most recent connections; idle extras time out
     pool_pre_ping=True,
-    pool_recycle=300,
+    pool_recycle=settings.database.pool_recycle,
+    connect_args=(
+        {"options": "-c synchronous_commit=off"}
+        if settings.database.synchronous_commit_off else {}
+    ),
+    # JSON columns (tags, images, raw_data, change_metadata, ...) go through orjson
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    query_cache_size=1200,  # Room for every collector/repository statement shape (default 500)
     future=True,  # Enable SQLAlchemy 2.0 behavior
 )
 
@@ -21,11 +40,66 @@ engine = create_engine(
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,  # Committed rows stay readable without a reload SELECT
     bind=engine,
     future=True,  # Enable SQLAlchemy 2.0 behavior
 )
 
 
+def utc_now() -> datetime:
+    """Client-side timestamp default; bulk inserts set it once per batch instead."""
+    return datetime.now(timezone.utc)
+
+
+class NamedPerSiteMixin:
+    """Bulk get-or-create for models unique on (name, site_id), e.g. authors and categories."""
+    
+    @classmethod
+    def _new_row_values(cls, name: str) -> Dict[str, Any]:
+        """Extra column values for rows created by get_or_create_many."""
+        return {}
+    
+    @classmethod
+    def get_or_create_many(cls, session, pairs: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], int]:
+        """Resolve (name, site_id) pairs to row IDs, creating the missing rows.
+        
+        One SELECT for the existing rows and, only if some are missing, one
+        INSERT ... ON CONFLICT DO NOTHING RETURNING for the rest.
+        """
+        pairs = set(pairs)
+        if not pairs:
+            return {}
+        
+        key_columns = tuple_(cls.name, cls.site_id)
+        ids = {
+            (name, site_id): row_id
+            for row_id, name, site_id in session.execute(
+                select(cls.id, cls.name, cls.site_id).where(key_columns.in_(pairs))
+            )
+        }
+        
+        missing = pairs - ids.keys()
+        if missing:
+            stmt = pg_insert(cls).values([
+                {'name': name, 'site_id': site_id, **cls._new_row_values(name)} for name, site_id in missing
+            ]).on_conflict_do_nothing(
+                index_elements=['name', 'site_id']
+            ).returning(cls.id, cls.name, cls.site_id)
+            ids.update(((name, site_id), row_id) for row_id, name, site_id in session.execute(stmt))
+            
+            # Rows another collector inserted in the meantime are not returned
+            raced = missing - ids.keys()
+            if raced:
+                ids.update(
+                    ((name, site_id), row_id)
+                    for row_id, name, site_id in session.execute(
+                        select(cls.id, cls.name, cls.site_id).where(key_columns.in_(raced))
+                    )
+                )
+        
+        return ids
+
+
 @as_declarative()
 class Base:
     """Base class for all database models with common fields."""
@@ -33,24 +107,19 @@ class Base:
     id: Any
     __name__: str
     
-    # Generate __tablename__ automatically
-    @declared_attr
-    def __tablename__(cls) -> str:
-        # Convert CamelCase to snake_case and add 's'
-        import re
-        name = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', cls.__name__)
-        name = re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).lower()
-        return name + 's' if not name.endswith('s') else name
+    # Every model declares its own __tablename__
     
     # Common timestamp fields
     created_at = Column(
         DateTime(timezone=True), 
+        default=utc_now,
         server_default=func.now(),
         nullable=False,
         index=True
     )
     updated_at = Column(
         DateTime(timezone=True), 
+        default=utc_now,
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
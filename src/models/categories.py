@@ -1,12 +1,14 @@
 """Category model for managing article categories."""
 
-from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey, UniqueConstraint, Boolean, DateTime, Float
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import Column, Integer, String, Text, JSON, ForeignKey, UniqueConstraint, Boolean, DateTime, Float, select, update
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, NamedPerSiteMixin
 
 
-class Category(Base):
+class Category(NamedPerSiteMixin, Base):
     """Model for storing article categories per site."""
     
     __tablename__ = "categories"
@@ -81,52 +83,121 @@ class Category(Base):
             self.hierarchy_path = self.name
             self.level = 0
     
-    def update_article_stats(self, session):
-        """Update category statistics based on articles."""
+    @classmethod
+    def _new_row_values(cls, name: str) -> Dict[str, Any]:
+        """New categories start with a title-cased display name."""
+        return {'display_name': name.title()}
+    
+    def update_article_stats(self, session, *, thirty_days_ago: Optional[datetime] = None):
+        """Update category statistics based on articles.
+        
+        Batch callers pass one precomputed ``thirty_days_ago`` cutoff for every category.
+        """
         from .articles import Article
-        from sqlalchemy import func
-        from datetime import datetime, timedelta
         
-        articles_query = session.query(Article).filter_by(
-            category_id=self.id,
-            is_deleted=False
-        )
+        # Recent articles (last 30 days)
+        if thirty_days_ago is None:
+            thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
         
-        self.total_articles = articles_query.count()
+        # Counts and date range in one pass over the category's articles
+        total, recent, first_seen, last_seen = session.execute(
+            select(
+                func.count(),
+                func.count().filter(Article.first_seen >= thirty_days_ago),
+                func.min(Article.first_seen),
+                func.max(Article.last_seen)
+            ).where(Article.category_id == self.id, Article.is_deleted == False)
+        ).one()
         
-        # Recent articles (last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        self.recent_articles_count = articles_query.filter(
-            Article.first_seen >= thirty_days_ago
-        ).count()
+        self.total_articles = total
+        self.recent_articles_count = recent
         
-        if self.total_articles > 0:
-            first_article = articles_query.order_by(Article.first_seen.asc()).first()
-            last_article = articles_query.order_by(Article.last_seen.desc()).first()
-            
-            self.first_article_date = first_article.first_seen
-            self.last_article_date = last_article.last_seen
+        if total > 0:
+            self.first_article_date = first_seen
+            self.last_article_date = last_seen
     
-    def calculate_trending_score(self, session):
-        """Calculate trending score based on recent activity."""
-        from datetime import datetime, timedelta
+    @classmethod
+    def refresh_stats_bulk(cls, session, site_id: Optional[int] = None) -> int:
+        """Recompute update_article_stats and the trending score for every category.
         
+        One GROUP BY over the articles, then one executemany UPDATE by primary
+        key. Categories without articles get zero counts and keep their dates.
+        Returns the number of categories updated.
+        """
+        from .articles import Article
+        
+        # One clock read: the same cutoff and decay reference for every category
+        now = datetime.now(timezone.utc)
+        thirty_days_ago = now - timedelta(days=30)
+        
+        article_filter = [Article.is_deleted == False]
+        if site_id:
+            article_filter.append(Article.site_id == site_id)
+        
+        stats = select(
+            Article.category_id,
+            func.count().label('total'),
+            func.count().filter(Article.first_seen >= thirty_days_ago).label('recent'),
+            func.min(Article.first_seen).label('first_seen'),
+            func.max(Article.last_seen).label('last_seen')
+        ).where(*article_filter).group_by(Article.category_id).subquery()
+        
+        query = select(
+            cls.id, cls.first_article_date, cls.last_article_date,
+            stats.c.total, stats.c.recent, stats.c.first_seen, stats.c.last_seen
+        ).outerjoin(stats, stats.c.category_id == cls.id).where(cls.is_deleted == False)
+        if site_id:
+            query = query.where(cls.site_id == site_id)
+        
+        rows = []
+        for category_id, first_article_date, last_article_date, total, recent, first_seen, last_seen in session.execute(query):
+            total = total or 0
+            recent = recent or 0
+            if total:
+                first_article_date, last_article_date = first_seen, last_seen
+            rows.append({
+                'id': category_id,
+                'total_articles': total,
+                'recent_articles_count': recent,
+                'first_article_date': first_article_date,
+                'last_article_date': last_article_date,
+                'trending_score': cls.trending_score_for(total, recent, last_article_date, now)
+            })
+        
+        if rows:
+            session.execute(update(cls), rows)
+        return len(rows)
+    
+    @staticmethod
+    def trending_score_for(total_articles: int, recent_articles_count: int,
+                           last_article_date: Optional[datetime],
+                           now: Optional[datetime] = None) -> float:
+        """Trending score from article counts and the last article date."""
         # Simple trending calculation: recent articles / total articles with time decay
-        if self.total_articles == 0:
-            self.trending_score = 0.0
-            return
+        if total_articles == 0:
+            return 0.0
         
         # Weight recent articles more heavily
-        recent_ratio = self.recent_articles_count / self.total_articles
+        recent_ratio = recent_articles_count / total_articles
         
         # Time decay based on last article
-        if self.last_article_date:
-            days_since_last = (datetime.utcnow() - self.last_article_date).days
+        if last_article_date:
+            if now is None:
+                now = datetime.now(timezone.utc)
+            if last_article_date.tzinfo is None:
+                last_article_date = last_article_date.replace(tzinfo=timezone.utc)
+            days_since_last = (now - last_article_date).days
             time_factor = max(0.1, 1.0 - (days_since_last / 30.0))  # Decay over 30 days
         else:
             time_factor = 0.1
         
-        self.trending_score = recent_ratio * time_factor * 100  # Scale to 0-100
+        return recent_ratio * time_factor * 100  # Scale to 0-100
+    
+    def calculate_trending_score(self, session):
+        """Calculate trending score based on recent activity."""
+        self.trending_score = Category.trending_score_for(
+            self.total_articles, self.recent_articles_count, self.last_article_date
+        )
     
     @property
     def full_path(self) -> str:
@@ -1,10 +1,65 @@
 """Collection statistics model for aggregated metrics."""
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index, JSON
-from sqlalchemy.sql import func
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index, DDL, case, distinct, event, exists, insert, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
+from sqlalchemy.sql import func, text
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
-from .base import Base
+from ..utils.logger import get_logger
+from .base import Base, utc_now
+
+logger = get_logger(__name__)
+
+# Pre-aggregated get_stats_summary rows, one per site (see migration 009)
+SUMMARY_VIEW = 'mv_collection_stats_summary_7d'
+SUMMARY_VIEW_DAYS = 7
+
+# Shared by the view and the other windows so both compute the same summary:
+# days without requests count as 0% success, 0 ms / 0.0 scores are "no data"
+_SUMMARY_SELECT = """
+    SELECT
+        site_id,
+        SUM(total_requests) AS total_requests,
+        AVG(CASE WHEN total_requests > 0
+            THEN successful_requests::float / total_requests * 100 ELSE 0 END) AS avg_success_rate,
+        SUM(total_articles_found) AS total_articles,
+        SUM(new_articles_created) AS total_new_articles,
+        AVG(NULLIF(avg_response_time_ms, 0)) AS avg_response_time,
+        AVG(NULLIF(avg_article_quality_score, 0)) AS avg_quality_score
+    FROM collection_stats
+    WHERE period_type = 'day' AND period_start >= now() - {window}{site_filter}
+    GROUP BY site_id
+"""
+_SUMMARY_FOR_SITE = text(_SUMMARY_SELECT.format(
+    window="make_interval(days => :days)", site_filter=" AND site_id = :site_id"
+))
+SUMMARY_VIEW_DDL = (
+    f"CREATE MATERIALIZED VIEW IF NOT EXISTS {SUMMARY_VIEW} AS"
+    + _SUMMARY_SELECT.format(window=f"interval '{SUMMARY_VIEW_DAYS} days'", site_filter=''),
+    # Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{SUMMARY_VIEW}_site ON {SUMMARY_VIEW} (site_id)",
+)
+
+# Monthly range partitions on period_start; rows outside them land in the default partition
+DEFAULT_PARTITION = 'collection_stats_default'
+
+# get_stats_summary results per (site_id, days), absorbing dashboard refresh loops
+SUMMARY_CACHE_TTL_SECONDS = 60
+_summary_cache: Dict[Tuple[int, int], Tuple[float, Optional[Dict[str, Any]]]] = {}
+
+
+def invalidate_summary_cache(site_ids: Optional[Iterable[int]] = None) -> None:
+    """Drop cached summaries for the given sites, or all of them."""
+    if site_ids is None:
+        _summary_cache.clear()
+        return
+    site_ids = set(site_ids)
+    for key in [key for key in _summary_cache if key[0] in site_ids]:
+        _summary_cache.pop(key, None)
 
 
 class CollectionStats(Base):
@@ -12,13 +67,14 @@ class CollectionStats(Base):
     
     __tablename__ = "collection_stats"
     
-    id = Column(Integer, primary_key=True, index=True)
-    site_id = Column(Integer, ForeignKey("sites.id"), nullable=False, index=True)
+    # The partition key has to be part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    site_id = Column(Integer, ForeignKey("sites.id"), nullable=False)
     
     # Time period
-    period_start = Column(DateTime(timezone=True), nullable=False, index=True)
+    period_start = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     period_end = Column(DateTime(timezone=True), nullable=False, index=True)
-    period_type = Column(String(20), nullable=False, index=True)  # hour, day, week, month
+    period_type = Column(String(20), nullable=False)  # hour, day, week, month
     
     # Collection metrics
     total_requests = Column(Integer, default=0, nullable=False)
@@ -44,7 +100,7 @@ class CollectionStats(Base):
     
     # Error tracking
     error_rate = Column(Float, nullable=True)  # Percentage of failed requests
-    error_types = Column(JSON, nullable=True)  # Count of different error types
+    error_types = Column(JSONB, nullable=True)  # Count of different error types
     retry_count = Column(Integer, default=0, nullable=False)
     
     # Quality metrics
@@ -53,9 +109,11 @@ class CollectionStats(Base):
     content_freshness_score = Column(Float, nullable=True)  # How fresh is the content
     
     # Performance indexes
+    # These also serve site_id and period_type lookups; period_start ranges prune partitions
     __table_args__ = (
         Index('idx_collection_stats_site_period', 'site_id', 'period_start', 'period_type'),
         Index('idx_collection_stats_period_type', 'period_type', 'period_start'),
+        {'postgresql_partition_by': 'RANGE (period_start)'},
     )
     
     # Relationships
@@ -67,27 +125,51 @@ class CollectionStats(Base):
             f"start={self.period_start}, articles={self.total_articles_found})>"
         )
     
-    @property
+    # Rate properties are hybrids, so they can also be filtered and ordered on in SQL,
+    # e.g. order_by(CollectionStats.success_rate.desc())
+    
+    @hybrid_property
     def success_rate(self) -> float:
         """Calculate success rate percentage."""
         if self.total_requests == 0:
             return 0.0
         return (self.successful_requests / self.total_requests) * 100
     
-    @property
+    @success_rate.expression
+    def success_rate(cls):
+        return case(
+            (cls.total_requests > 0, cls.successful_requests * 100.0 / cls.total_requests),
+            else_=0.0
+        )
+    
+    @hybrid_property
     def new_article_rate(self) -> float:
         """Calculate percentage of new articles vs total found."""
         if self.total_articles_found == 0:
             return 0.0
         return (self.new_articles_created / self.total_articles_found) * 100
     
-    @property
+    @new_article_rate.expression
+    def new_article_rate(cls):
+        return case(
+            (cls.total_articles_found > 0, cls.new_articles_created * 100.0 / cls.total_articles_found),
+            else_=0.0
+        )
+    
+    @hybrid_property
     def avg_response_size_kb(self) -> float:
         """Average response size in KB."""
         if self.total_requests == 0:
             return 0.0
         return (self.total_response_size_bytes / self.total_requests) / 1024
     
+    @avg_response_size_kb.expression
+    def avg_response_size_kb(cls):
+        return case(
+            (cls.total_requests > 0, cls.total_response_size_bytes * 1.0 / cls.total_requests / 1024),
+            else_=0.0
+        )
+    
     def calculate_error_rate(self):
         """Calculate and update error rate."""
         if self.total_requests > 0:
@@ -95,34 +177,137 @@ class CollectionStats(Base):
         else:
             self.error_rate = 0.0
     
+    @classmethod
+    def recompute_error_rates(cls, session, since: datetime, site_id: Optional[int] = None) -> int:
+        """Recalculate error_rate for every period starting at or after ``since`` in one UPDATE.
+        
+        Returns the number of rows updated.
+        """
+        stmt = update(cls).where(cls.period_start >= since)
+        if site_id:
+            stmt = stmt.where(cls.site_id == site_id)
+        stmt = stmt.values(error_rate=case(
+            (cls.total_requests > 0, cls.failed_requests * 100.0 / cls.total_requests),
+            else_=0.0
+        )).execution_options(synchronize_session=False)
+        return session.execute(stmt).rowcount
+    
     def calculate_content_freshness_score(self, session):
         """Calculate freshness score based on recent articles."""
         from .articles import Article
-        from datetime import datetime, timedelta
         
-        # Get articles created in this period
-        articles_in_period = session.query(Article).filter(
+        score = session.query(
+            self._freshness_average()
+        ).filter(
             Article.site_id == self.site_id,
             Article.first_seen >= self.period_start,
-            Article.first_seen < self.period_end
-        ).all()
+            Article.first_seen < self.period_end,
+            Article.is_deleted == False
+        ).scalar()
         
-        if not articles_in_period:
-            self.content_freshness_score = 0.0
-            return
+        self.content_freshness_score = float(score) if score is not None else 0.0
+    
+    @staticmethod
+    def _freshness_average():
+        """SQL average of per-article freshness over the selected articles."""
+        from .articles import Article
         
-        # Calculate based on how recent the published dates are
-        now = datetime.utcnow()
-        total_freshness = 0.0
+        # Fresher articles score higher (100 when published today, minus 2 points
+        # per day); articles without a publish date count as 0
+        freshness = func.greatest(
+            0, 100 - func.extract('day', func.now() - Article.published_at) * 2
+        )
+        return func.avg(func.coalesce(freshness, 0))
+    
+    @classmethod
+    def _aggregate_period(cls, session, site_ids: Sequence[int], period_start: datetime,
+                          period_end: datetime, with_snapshots: bool = True,
+                          with_articles: bool = True) -> Dict[int, Dict[str, Any]]:
+        """Period metrics for each site, from one GROUP BY over snapshots and one over articles.
+        
+        Returns column values keyed by site ID; sites with no rows in the period
+        get zero counts. Callers that already know a table has no rows in the
+        period can skip its aggregate.
+        """
+        from .snapshots import Snapshot
+        from .articles import Article
         
-        for article in articles_in_period:
-            if article.published_at:
-                days_old = (now - article.published_at).days
-                # Fresher articles get higher scores (max 100 for articles published today)
-                freshness = max(0, 100 - (days_old * 2))  # Lose 2 points per day
-                total_freshness += freshness
+        metrics = {
+            site_id: {
+                'total_requests': 0, 'successful_requests': 0, 'failed_requests': 0,
+                'avg_response_time_ms': None, 'max_response_time_ms': None,
+                'min_response_time_ms': None, 'total_response_size_bytes': 0,
+                'data_quality_score': None, 'error_rate': 0.0,
+                'total_articles_found': 0, 'new_articles_created': 0,
+                'existing_articles_updated': 0, 'unique_authors_found': 0,
+                'unique_categories_found': 0, 'avg_article_quality_score': None,
+                'content_freshness_score': 0.0,
+            }
+            for site_id in site_ids
+        }
         
-        self.content_freshness_score = total_freshness / len(articles_in_period)
+        if with_snapshots:
+            # Snapshot metrics; a row stands for hit_count requests (deduplicated
+            # polls), timings are per stored response; zero timings/scores count as missing
+            snapshot_rows = session.query(
+                Snapshot.site_id,
+                func.sum(Snapshot.hit_count),
+                func.coalesce(func.sum(Snapshot.hit_count).filter(Snapshot.response_status.between(200, 299)), 0),
+                func.avg(func.nullif(Snapshot.response_time_ms, 0)),
+                func.max(func.nullif(Snapshot.response_time_ms, 0)),
+                func.min(func.nullif(Snapshot.response_time_ms, 0)),
+                func.coalesce(func.sum(Snapshot.response_size_bytes * Snapshot.hit_count), 0),
+                func.avg(func.nullif(Snapshot.data_quality_score, 0))
+            ).filter(
+                Snapshot.site_id.in_(site_ids),
+                Snapshot.timestamp >= period_start,
+                Snapshot.timestamp < period_end
+            ).group_by(Snapshot.site_id)
+            
+            for (site_id, total, successful, avg_time, max_time, min_time,
+                 total_size, avg_data_quality) in snapshot_rows:
+                metrics[site_id].update(
+                    total_requests=total,
+                    successful_requests=successful,
+                    failed_requests=total - successful,
+                    avg_response_time_ms=float(avg_time) if avg_time is not None else None,
+                    max_response_time_ms=max_time,
+                    min_response_time_ms=min_time,
+                    total_response_size_bytes=total_size,
+                    data_quality_score=avg_data_quality,
+                    error_rate=(total - successful) / total * 100 if total else 0.0
+                )
+        
+        if with_articles:
+            # Article metrics over live articles (idx_articles_site_first_seen_cover)
+            article_rows = session.query(
+                Article.site_id,
+                func.count(),
+                func.count().filter(Article.first_seen == Article.last_seen),
+                func.count(distinct(Article.author_id)),
+                func.count(distinct(Article.category_id)),
+                func.avg(case((Article.quality_score > 0, Article.quality_score))),
+                cls._freshness_average()
+            ).filter(
+                Article.site_id.in_(site_ids),
+                Article.first_seen >= period_start,
+                Article.first_seen < period_end,
+                Article.is_deleted == False
+            ).group_by(Article.site_id)
+            
+            for (site_id, total, new, authors, categories, avg_quality,
+                 freshness) in article_rows:
+                metrics[site_id].update(
+                    total_articles_found=total,
+                    new_articles_created=new,
+                    existing_articles_updated=total - new,
+                    unique_authors_found=authors,
+                    unique_categories_found=categories,
+                    avg_article_quality_score=avg_quality,
+                    content_freshness_score=float(freshness) if freshness is not None else 0.0
+                )
+        
+        return metrics
     
     @classmethod
     def create_period_stats(cls, session, site_id: int, period_start: datetime, 
@@ -130,118 +315,166 @@ class CollectionStats(Base):
         """Create statistics for a specific period."""
         from .snapshots import Snapshot
         from .articles import Article
-        from datetime import datetime
-        
-        # Get snapshots in period
-        snapshots = session.query(Snapshot).filter(
-            Snapshot.site_id == site_id,
-            Snapshot.timestamp >= period_start,
-            Snapshot.timestamp < period_end
-        ).all()
-        
-        # Calculate snapshot metrics
-        total_requests = len(snapshots)
-        successful_requests = len([s for s in snapshots if s.is_successful])
-        failed_requests = total_requests - successful_requests
-        
-        response_times = [s.response_time_ms for s in snapshots if s.response_time_ms]
-        avg_response_time = sum(response_times) / len(response_times) if response_times else None
-        max_response_time = max(response_times) if response_times else None
-        min_response_time = min(response_times) if response_times else None
-        
-        total_response_size = sum(s.response_size_bytes or 0 for s in snapshots)
-        
-        # Get articles in period
-        articles_in_period = session.query(Article).filter(
-            Article.site_id == site_id,
-            Article.first_seen >= period_start,
-            Article.first_seen < period_end,
-            Article.is_deleted == False
-        ).all()
-        
-        # Calculate article metrics
-        total_articles_found = len(articles_in_period)
-        new_articles = len([a for a in articles_in_period if a.first_seen == a.last_seen])
-        updated_articles = total_articles_found - new_articles
         
-        # Get unique counts
-        unique_authors = len(set(a.author_id for a in articles_in_period if a.author_id))
-        unique_categories = len(set(a.category_id for a in articles_in_period if a.category_id))
+        # One cheap probe so idle sites skip the aggregate scans entirely
+        has_snapshots, has_articles = session.query(
+            exists().where(
+                Snapshot.site_id == site_id,
+                Snapshot.timestamp >= period_start,
+                Snapshot.timestamp < period_end
+            ),
+            exists().where(
+                Article.site_id == site_id,
+                Article.first_seen >= period_start,
+                Article.first_seen < period_end,
+                Article.is_deleted == False
+            )
+        ).one()
         
-        # Calculate quality metrics
-        quality_scores = [a.quality_score for a in articles_in_period if a.quality_score > 0]
-        avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else None
+        metrics = cls._aggregate_period(
+            session, [site_id], period_start, period_end,
+            with_snapshots=has_snapshots, with_articles=has_articles
+        )[site_id]
         
-        # Create stats record
         stats = cls(
             site_id=site_id,
             period_start=period_start,
             period_end=period_end,
             period_type=period_type,
-            
-            # Request metrics
-            total_requests=total_requests,
-            successful_requests=successful_requests,
-            failed_requests=failed_requests,
-            avg_response_time_ms=avg_response_time,
-            max_response_time_ms=max_response_time,
-            min_response_time_ms=min_response_time,
-            total_response_size_bytes=total_response_size,
-            
-            # Article metrics
-            total_articles_found=total_articles_found,
-            new_articles_created=new_articles,
-            existing_articles_updated=updated_articles,
-            unique_authors_found=unique_authors,
-            unique_categories_found=unique_categories,
-            avg_article_quality_score=avg_quality,
+            **metrics
         )
         
-        # Calculate derived metrics
-        stats.calculate_error_rate()
-        stats.calculate_content_freshness_score(session)
-        
-        # Calculate average data quality from snapshots
-        data_quality_scores = [s.data_quality_score for s in snapshots if s.data_quality_score]
-        if data_quality_scores:
-            stats.data_quality_score = sum(data_quality_scores) / len(data_quality_scores)
-        
         session.add(stats)
         session.flush()
+        invalidate_summary_cache([site_id])
         
         return stats
     
+    @classmethod
+    def create_period_stats_bulk(cls, session, site_ids: Sequence[int], period_start: datetime,
+                                 period_end: datetime, period_type: str) -> List[int]:
+        """Create one period statistics row per site with a single multi-row INSERT.
+        
+        No ORM instances are built; the generated IDs come back through RETURNING
+        in the same round-trip. Returns the IDs of the inserted rows.
+        """
+        site_ids = list(dict.fromkeys(site_ids))
+        if not site_ids:
+            return []
+        
+        metrics = cls._aggregate_period(session, site_ids, period_start, period_end)
+        now = utc_now()
+        rows = [
+            {
+                'site_id': site_id,
+                'period_start': period_start,
+                'period_end': period_end,
+                'period_type': period_type,
+                'created_at': now,
+                'updated_at': now,
+                **site_metrics
+            }
+            for site_id, site_metrics in metrics.items()
+        ]
+        ids = session.execute(insert(cls).returning(cls.id), rows).scalars().all()
+        invalidate_summary_cache(site_ids)
+        return ids
+    
     @classmethod
     def get_latest_stats(cls, session, site_id: int, period_type: str, limit: int = 10):
         """Get the most recent statistics for a site and period type."""
-        return session.query(cls).filter_by(
-            site_id=site_id,
-            period_type=period_type
+        stmt = select(cls).where(
+            cls.site_id == site_id,
+            cls.period_type == period_type
         ).order_by(
             cls.period_start.desc()
-        ).limit(limit).all()
+        ).limit(limit)
+        return session.execute(stmt).scalars().all()
     
     @classmethod
     def get_stats_summary(cls, session, site_id: int, days: int = 7):
-        """Get a summary of statistics for the last N days."""
-        from datetime import datetime, timedelta
+        """Get a summary of statistics for the last N days.
         
-        start_date = datetime.utcnow() - timedelta(days=days)
+        The default 7-day window is a single row read from the
+        ``mv_collection_stats_summary_7d`` materialized view, kept current by
+        refresh_summary_view; other windows are aggregated from the daily rows.
+        Results are cached in-process for ``SUMMARY_CACHE_TTL_SECONDS``.
+        """
+        key = (site_id, days)
+        cached = _summary_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1]) if cached[1] is not None else None
         
-        stats = session.query(cls).filter(
-            cls.site_id == site_id,
-            cls.period_start >= start_date,
-            cls.period_type == 'day'
-        ).all()
+        summary = cls._compute_stats_summary(session, site_id, days)
+        _summary_cache[key] = (time.monotonic() + SUMMARY_CACHE_TTL_SECONDS, summary)
+        return dict(summary) if summary is not None else None
+    
+    @classmethod
+    def _compute_stats_summary(cls, session, site_id: int, days: int):
+        """Build the get_stats_summary result from the view or the daily rows."""
+        params = {'site_id': site_id, 'days': days}
+        if days == SUMMARY_VIEW_DAYS:
+            try:
+                # Savepoint: a missing view must not abort the caller's transaction
+                with session.begin_nested():
+                    row = session.execute(
+                        text(f"SELECT * FROM {SUMMARY_VIEW} WHERE site_id = :site_id"), params
+                    ).mappings().first()
+            except ProgrammingError:
+                # Schema predates the view; refresh_summary_view creates it
+                row = session.execute(_SUMMARY_FOR_SITE, params).mappings().first()
+        else:
+            row = session.execute(_SUMMARY_FOR_SITE, params).mappings().first()
         
-        if not stats:
+        if row is None:
             return None
+        summary = dict(row)
+        del summary['site_id']
+        return summary
+    
+    @staticmethod
+    def refresh_summary_view(session):
+        """Rebuild the 7-day summary view without blocking readers, creating it if missing."""
+        for statement in SUMMARY_VIEW_DDL:
+            session.execute(text(statement))
+        session.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {SUMMARY_VIEW}"))
+        invalidate_summary_cache()
+    
+    @staticmethod
+    def ensure_partitions(session, months_ahead: int = 3) -> None:
+        """Create the monthly partitions from the current month through ``months_ahead`` months.
         
-        return {
-            'total_requests': sum(s.total_requests for s in stats),
-            'avg_success_rate': sum(s.success_rate for s in stats) / len(stats),
-            'total_articles': sum(s.total_articles_found for s in stats),
-            'total_new_articles': sum(s.new_articles_created for s in stats),
-            'avg_response_time': sum(s.avg_response_time_ms or 0 for s in stats) / len([s for s in stats if s.avg_response_time_ms]),
-            'avg_quality_score': sum(s.avg_article_quality_score or 0 for s in stats) / len([s for s in stats if s.avg_article_quality_score]),
-        }
\ No newline at end of file
+        Existing partitions are left alone, so this is safe to call every collection cycle.
+        A month that cannot be created (e.g. its rows already sit in the default
+        partition) is logged and skipped without aborting the others.
+        """
+        month = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(months_ahead + 1):
+            next_month = (month.replace(year=month.year + 1, month=1) if month.month == 12
+                          else month.replace(month=month.month + 1))
+            try:
+                with session.begin_nested():
+                    session.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS collection_stats_{month:%Y_%m} "
+                        f"PARTITION OF collection_stats "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+                    ))
+            except SQLAlchemyError as e:
+                logger.warning(f"Could not create collection_stats partition for {month:%Y-%m}: {e}")
+            month = next_month
+
+
+# Tables created with create_all still need somewhere to put rows before ensure_partitions runs
+event.listen(
+    CollectionStats.__table__, 'after_create',
+    DDL(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF collection_stats DEFAULT")
+    .execute_if(dialect='postgresql')
+)
+
+# create_all schemas get the summary view too; migrations 009/017 create it otherwise
+for statement in SUMMARY_VIEW_DDL:
+    event.listen(CollectionStats.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+event.listen(
+    CollectionStats.__table__, 'before_drop',
+    DDL(f"DROP MATERIALIZED VIEW IF EXISTS {SUMMARY_VIEW}").execute_if(dialect='postgresql')
+)
@@ -2,7 +2,7 @@
 
 from sqlalchemy import Column, Integer, String, DateTime, Float
 from sqlalchemy.sql import func
-from .base import Base
+from .base import Base, utc_now
 
 
 class SiteAnalytics(Base):
@@ -25,8 +25,8 @@ class SiteAnalytics(Base):
     success_rate = Column(Float, nullable=True)  # Percentage of successful requests
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), onupdate=func.now())
     
     def __repr__(self):
         return (
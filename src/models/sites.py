@@ -1,7 +1,9 @@
 """Site model for managing multiple technology sites."""
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, JSON, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -15,7 +17,7 @@ class Site(Base):
     name = Column(String(100), nullable=False, unique=True, index=True)
     site_id = Column(String(50), nullable=False, unique=True, index=True)  # Used in other tables
     base_url = Column(String(500), nullable=False)
-    api_endpoints = Column(JSON, nullable=False)  # Store multiple endpoints config
+    api_endpoints = Column(JSONB, nullable=False)  # Store multiple endpoints config
     
     # Site configuration
     rate_limit_per_hour = Column(Integer, default=60, nullable=False)
@@ -25,7 +27,7 @@ class Site(Base):
     
     # Authentication if needed
     requires_auth = Column(Boolean, default=False, nullable=False)
-    auth_config = Column(JSON, nullable=True)  # Store auth configuration
+    auth_config = Column(JSONB, nullable=True)  # Store auth configuration
     
     # Site metadata
     description = Column(Text, nullable=True)
@@ -61,7 +63,10 @@ class Site(Base):
         self.collection_error_count = 0
         self.last_successful_collection = datetime.utcnow()
     
-    @property
+    @hybrid_property
     def is_healthy(self) -> bool:
-        """Check if site collection is healthy (less than 5 consecutive errors)."""
+        """Check if site collection is healthy (less than 5 consecutive errors).
+        
+        The same comparison compiles to SQL, e.g. ``filter(~Site.is_healthy)``.
+        """
         return self.collection_error_count < 5
\ No newline at end of file
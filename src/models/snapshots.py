@@ -1,9 +1,19 @@
 """Snapshot model for storing raw API responses."""
 
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, ForeignKey, Index, Float, Boolean
-from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
-from .base import Base
+import hashlib
+import zlib
+from datetime import datetime
+from typing import Any, Optional
+import numpy as np
+import orjson
+from sqlalchemy import Column, Computed, Integer, String, DateTime, Text, ForeignKey, Index, Float, Boolean, LargeBinary, and_, case, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func, text
+from sqlalchemy.orm import deferred, relationship
+from .base import Base, utc_now
+
+# Compressed forms of the empty payloads the collectors store (e.g. failed requests)
+_EMPTY_COMPRESSED_PAYLOADS = tuple(zlib.compress(body, 6) for body in (b'{}', b'[]'))
 
 
 class Snapshot(Base):
@@ -12,31 +22,42 @@ class Snapshot(Base):
     __tablename__ = "snapshots"
     
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    timestamp = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), index=True)
     
     # Site relationship
-    site_id = Column(Integer, ForeignKey("sites.id"), nullable=False, index=True)
+    site_id = Column(Integer, ForeignKey("sites.id"), nullable=False)  # Leads idx_snapshot_site_timestamp
     
     # Request details
     endpoint = Column(String(255), nullable=False, index=True)
     method = Column(String(10), default='GET', nullable=False)
-    request_headers = Column(JSON, nullable=True)
-    request_params = Column(JSON, nullable=True)
+    request_headers = Column(JSONB, nullable=True)
+    request_params = Column(JSONB, nullable=True)
     
     # Response details
     response_status = Column(Integer, nullable=False, index=True)
-    response_headers = Column(JSON, nullable=True)
+    # Stored by Postgres from response_status; loaded rows carry it like any column
+    is_successful = Column(Boolean, Computed('response_status >= 200 AND response_status < 300', persisted=True))
+    response_headers = Column(JSONB, nullable=True)
     response_time_ms = Column(Integer, nullable=True)
     response_size_bytes = Column(Integer, nullable=True)
     
     # Data and processing
-    raw_data = Column(JSON, nullable=False)
+    # Payloads load on first access, so metadata queries never fetch or decode them
+    raw_data = deferred(Column(JSONB, nullable=True), group='payload')  # Legacy rows; new snapshots use raw_compressed
+    raw_compressed = deferred(Column(LargeBinary, nullable=True), group='payload')  # zlib-compressed JSON payload
     processed_count = Column(Integer, default=0, nullable=False)  # Number of items processed
     error_message = Column(Text, nullable=True)
     
+    # Content deduplication
+    content_hash = Column(String(64), nullable=True)  # Hash of the raw response body
+    last_seen = Column(DateTime(timezone=True), default=utc_now, server_default=func.now(), nullable=True)  # Last time this content was returned
+    # Requests this row stands for: identical polls and repeated errors only bump it,
+    # so request counts sum it instead of counting rows (attributed to `timestamp`)
+    hit_count = Column(Integer, default=1, server_default='1', nullable=False)
+    
     # Data quality metrics
     data_quality_score = Column(Float, nullable=True)  # 0-100 score
-    validation_errors = Column(JSON, nullable=True)  # Schema validation errors
+    validation_errors = Column(JSONB, nullable=True)  # Schema validation errors
     
     # Collection metadata
     collection_batch_id = Column(String(100), nullable=True, index=True)  # Group related snapshots
@@ -46,9 +67,15 @@ class Snapshot(Base):
     
     # Performance indexes
     __table_args__ = (
-        Index('idx_snapshot_site_timestamp', 'site_id', 'timestamp'),
+        # Covers the CollectionStats period aggregates with an index-only scan
+        Index('idx_snapshot_site_timestamp', 'site_id', 'timestamp',
+              postgresql_include=['response_status', 'response_time_ms', 'response_size_bytes', 'data_quality_score',
+                                  'hit_count']),
         Index('idx_snapshot_status_timestamp', 'response_status', 'timestamp'),
+        # Latest-successful lookups scan only successful snapshots
+        Index('idx_snapshot_site_successful', 'site_id', 'timestamp', postgresql_where=text('is_successful')),
         Index('idx_snapshot_batch_timestamp', 'collection_batch_id', 'timestamp'),
+        Index('uq_snapshot_site_content_hash', 'site_id', 'content_hash', unique=True),
     )
     
     # Relationships
@@ -59,10 +86,27 @@ class Snapshot(Base):
     def __repr__(self):
         return f"<Snapshot(id={self.id}, site_id={self.site_id}, status={self.response_status}, timestamp={self.timestamp})>"
     
+    @staticmethod
+    def compute_content_hash(content: bytes) -> str:
+        """Hash a raw response body for snapshot deduplication."""
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+    
+    @staticmethod
+    def compress_raw_body(content: bytes) -> bytes:
+        """Compress a raw JSON response body for storage as-is."""
+        return zlib.compress(content, 6)
+    
+    @staticmethod
+    def compress_raw_data(data: Any) -> bytes:
+        """Serialize and compress a parsed API payload for storage."""
+        return Snapshot.compress_raw_body(orjson.dumps(data))
+    
     @property
-    def is_successful(self) -> bool:
-        """Check if the snapshot represents a successful API call."""
-        return 200 <= self.response_status < 300
+    def raw_data_decoded(self) -> Any:
+        """Raw API payload, whichever column it was stored in."""
+        if self.raw_compressed is not None:
+            return orjson.loads(zlib.decompress(self.raw_compressed))
+        return self.raw_data
     
     @property
     def is_client_error(self) -> bool:
@@ -83,7 +127,8 @@ class Snapshot(Base):
             score -= 50.0
         
         # Deduct points for empty data
-        if not self.raw_data or (isinstance(self.raw_data, (list, dict)) and len(self.raw_data) == 0):
+        raw_data = self.raw_data_decoded
+        if not raw_data or (isinstance(raw_data, (list, dict)) and len(raw_data) == 0):
             score -= 30.0
         
         # Deduct points for validation errors
@@ -96,26 +141,80 @@ class Snapshot(Base):
         
         return max(0.0, score)
     
+    @staticmethod
+    def score_batch(status: np.ndarray, empty: np.ndarray, validation_error_count: np.ndarray,
+                    response_time_ms: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_data_quality_score over column arrays.
+        
+        ``response_time_ms`` uses 0 for unknown response times.
+        """
+        score = np.full(status.shape, 100.0)
+        score -= 50.0 * ((status < 200) | (status >= 300))
+        score -= 30.0 * empty
+        score -= np.minimum(20.0, validation_error_count * 2.0)
+        score -= 10.0 * (response_time_ms > 10000)
+        return np.maximum(0.0, score)
+    
+    @classmethod
+    def rescore_quality(cls, session, since: Optional[datetime] = None, batch_size: int = 1000) -> int:
+        """Recompute data_quality_score for many snapshots without loading them as objects.
+        
+        The scoring inputs are derived in SQL, scored a batch at a time with
+        score_batch and written back with one bulk UPDATE per batch.
+        Returns the number of snapshots scored.
+        """
+        empty = or_(
+            cls.raw_compressed.in_(_EMPTY_COMPRESSED_PAYLOADS),
+            and_(
+                cls.raw_compressed.is_(None),
+                or_(cls.raw_data.is_(None), cls.raw_data.in_([{}, []]))
+            )
+        )
+        validation_error_count = case(
+            (func.jsonb_typeof(cls.validation_errors) == 'array', func.jsonb_array_length(cls.validation_errors)),
+            else_=0
+        )
+        stmt = select(
+            cls.id, cls.response_status, empty, validation_error_count,
+            func.coalesce(cls.response_time_ms, 0)
+        )
+        if since is not None:
+            stmt = stmt.where(cls.timestamp >= since)
+        
+        scored = 0
+        result = session.execute(stmt.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            ids, status, is_empty, error_count, response_time_ms = (np.array(column) for column in zip(*rows))
+            scores = cls.score_batch(status, is_empty.astype(bool), error_count, response_time_ms)
+            session.execute(update(cls), [
+                {'id': snapshot_id, 'data_quality_score': score}
+                for snapshot_id, score in zip(ids.tolist(), scores.tolist())
+            ])
+            scored += len(rows)
+        
+        return scored
+    
     @classmethod
     def get_latest_successful_snapshot(cls, session, site_id: int, endpoint: str):
         """Get the most recent successful snapshot for a site/endpoint."""
-        return session.query(cls).filter_by(
-            site_id=site_id,
-            endpoint=endpoint
-        ).filter(
-            cls.response_status >= 200,
-            cls.response_status < 300
+        stmt = select(cls).where(
+            cls.site_id == site_id,
+            cls.endpoint == endpoint,
+            cls.is_successful
         ).order_by(
             cls.timestamp.desc()
-        ).first()
+        ).limit(1)
+        return session.execute(stmt).scalars().first()
     
     @classmethod
     def get_error_snapshots(cls, session, site_id: int, hours: int = 24):
         """Get recent error snapshots for a site."""
-        from datetime import datetime, timedelta
+        from datetime import timedelta
         
-        return session.query(cls).filter(
+        # The window is a bound interval against the database clock
+        stmt = select(cls).where(
             cls.site_id == site_id,
             cls.response_status >= 400,
-            cls.timestamp >= datetime.utcnow() - timedelta(hours=hours)
-        ).order_by(cls.timestamp.desc()).all()
\ No newline at end of file
+            cls.timestamp >= func.now() - timedelta(hours=hours)
+        ).order_by(cls.timestamp.desc())
+        return session.execute(stmt).scalars().all()
\ No newline at end of file
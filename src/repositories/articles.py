@@ -1,12 +1,68 @@
 """Article repository for managing processed articles."""
 
-from typing import List, Optional, Dict, Any, Tuple
+import math
+from itertools import chain
+from typing import Iterable, List, Optional, Dict, Any, Sequence, Set, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, asc, func
-from .base import BaseRepository
+import numpy as np
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from sqlalchemy import desc, asc, distinct, func, insert, select, update
+from .base import BaseRepository, STREAM_BATCH_SIZE
 from ..models.articles import Article
-from ..models.article_history import ArticleHistory
+from ..models.article_history import ArticleHistory, ChangePayload
+from ..models.base import utc_now
+
+# Set bits per byte value, for popcounts over np.packbits output
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.int64)
+
+
+def duplicate_probe(words: Set[str], similarity_threshold: float) -> Optional[List[str]]:
+    """Words one of which every title with Jaccard >= threshold must contain.
+    
+    Such a title shares at least ``ceil(threshold * len(words))`` words with
+    ``words``, so by pigeonhole it contains one of any ``len(words) - shared + 1``
+    of them; the longest (rarest) are picked. None means no word is required.
+    """
+    # The epsilon keeps float noise (0.7 * 10 = 7.000000000000001) from rounding up
+    min_shared = math.ceil(similarity_threshold * len(words) - 1e-9)
+    if min_shared <= 0:
+        return None
+    return sorted(words, key=len, reverse=True)[:len(words) - min_shared + 1]
+
+
+def jaccard_matches(words: Set[str], candidates: Sequence[Tuple[int, Sequence[str]]],
+                    similarity_threshold: float) -> List[int]:
+    """IDs of the (id, tokens) candidates whose Jaccard similarity to ``words`` reaches the threshold.
+    
+    Every title becomes a packed bitset over the shared vocabulary, so the
+    intersections and unions of all candidates are one AND/OR + popcount pass.
+    """
+    if not candidates:
+        return []
+    
+    count = len(candidates)
+    ids = np.fromiter((candidate_id for candidate_id, _ in candidates), dtype=np.int64, count=count)
+    lengths = np.fromiter((len(tokens or ()) for _, tokens in candidates), dtype=np.int64, count=count)
+    tokens = list(chain.from_iterable(tokens or () for _, tokens in candidates))
+    
+    # Candidate tokens first, then the query words, mapped to vocabulary columns
+    vocabulary, columns = np.unique(np.array(tokens + list(words), dtype=str), return_inverse=True)
+    columns = columns.reshape(-1)
+    candidate_bits = np.zeros((count, len(vocabulary)), dtype=bool)
+    candidate_bits[np.repeat(np.arange(count), lengths), columns[:len(tokens)]] = True
+    query_bits = np.zeros(len(vocabulary), dtype=bool)
+    query_bits[columns[len(tokens):]] = True
+    if len(vocabulary) and vocabulary[0] == '':
+        # Empty strings from leading/trailing whitespace are not words (they sort first)
+        candidate_bits[:, 0] = query_bits[0] = False
+    
+    packed = np.packbits(candidate_bits, axis=1)
+    packed_query = np.packbits(query_bits)
+    shared = _POPCOUNT[packed & packed_query].sum(axis=1)
+    union = _POPCOUNT[packed | packed_query].sum(axis=1)
+    
+    similarity = np.divide(shared, union, out=np.zeros(count), where=union > 0)
+    return ids[(union > 0) & (similarity >= similarity_threshold)].tolist()
 
 
 class ArticleRepository(BaseRepository[Article]):
@@ -40,6 +96,52 @@ class ArticleRepository(BaseRepository[Article]):
         """Find article by external ID and site."""
         return Article.find_by_external_id(self.session, external_id, site_id)
     
+    def find_by_external_ids(self, external_ids: Iterable[str], site_id: int,
+                             load_columns: Sequence[Any] = ()) -> Dict[str, Article]:
+        """Find articles by external IDs for a site in one query, keyed by external ID.
+        
+        ``load_columns`` restricts the SELECT to those columns (plus the primary
+        key); any other column is loaded lazily, one query per article.
+        """
+        external_ids = list(external_ids)
+        if not external_ids:
+            return {}
+        
+        query = self.session.query(Article)
+        if load_columns:
+            query = query.options(load_only(*load_columns))
+        
+        articles = query.filter(
+            Article.external_id.in_(external_ids),
+            Article.site_id == site_id,
+            Article.is_deleted == False
+        ).all()
+        
+        return {article.external_id: article for article in articles}
+    
+    def bulk_create_articles(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert several articles with one executemany, returning the number inserted.
+        
+        Records skip the ORM unit of work, so they must all share the same keys.
+        """
+        # One client-side timestamp for the batch instead of a default call per row
+        now = utc_now()
+        timestamps = {'first_seen': now, 'last_seen': now, 'created_at': now, 'updated_at': now}
+        
+        rows = []
+        for record in records:
+            # Same derived fields as create_article
+            row = {**timestamps, **record}
+            if not row.get('slug'):
+                row['slug'] = Article.slug_from_url(row.get('url'))
+            row['reading_time_minutes'] = Article.reading_time_for(row.get('word_count'))
+            rows.append(row)
+        
+        if rows:
+            self.session.execute(insert(Article), rows)
+        
+        return len(rows)
+    
     def get_articles_by_site(self, site_id: int, limit: int = 50, 
                            include_inactive: bool = False) -> List[Article]:
         """Get articles for a specific site."""
@@ -54,11 +156,22 @@ class ArticleRepository(BaseRepository[Article]):
         return query.order_by(desc(Article.first_seen)).limit(limit).all()
     
     def get_recent_articles(self, site_id: int = None, hours: int = 24, 
-                          limit: int = 50) -> List[Article]:
-        """Get recently discovered articles."""
+                          limit: int = 50, with_relations: bool = False) -> List[Article]:
+        """Get recently discovered articles.
+        
+        With ``with_relations`` the authors and categories are loaded in one
+        extra IN query each, for callers that read ``article.author.name``.
+        """
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
         
-        query = self.session.query(Article).filter(
+        query = self.session.query(Article)
+        if with_relations:
+            query = query.options(
+                selectinload(Article.author),
+                selectinload(Article.category)
+            )
+        
+        query = query.filter(
             Article.first_seen >= cutoff_time,
             Article.is_deleted == False,
             Article.is_active == True
@@ -103,32 +216,30 @@ class ArticleRepository(BaseRepository[Article]):
         return query.order_by(desc(Article.first_seen)).all()
     
     def find_potential_duplicates(self, article: Article, similarity_threshold: float = 0.8) -> List[Article]:
-        """Find potential duplicate articles based on title similarity."""
-        # Simple implementation - in production, you might use more sophisticated methods
-        words = set(article.title.lower().split())
+        """Find potential duplicate articles based on title word (Jaccard) similarity.
+        
+        Words come from the same Postgres expression as ``Article.title_tokens``,
+        so the GIN-indexed prefilter (see duplicate_probe) and the scoring agree
+        on tokenization. Only the matches are loaded as Article objects.
+        """
+        tokens = self.session.execute(select(Article.title_tokens_of(article.title))).scalar_one()
+        words = set(tokens) - {''}
         
-        candidates = self.session.query(Article).filter(
+        query = self.session.query(Article.id, Article.title_tokens).filter(
             Article.site_id != article.site_id,  # Different sites
             Article.is_deleted == False,
             Article.is_active == True,
             Article.id != article.id
-        ).all()
+        )
         
-        potential_duplicates = []
+        probe = duplicate_probe(words, similarity_threshold)
+        if probe is not None:
+            query = query.filter(Article.title_tokens.overlap(probe))
         
-        for candidate in candidates:
-            candidate_words = set(candidate.title.lower().split())
-            
-            # Calculate Jaccard similarity
-            intersection = len(words.intersection(candidate_words))
-            union = len(words.union(candidate_words))
-            
-            if union > 0:
-                similarity = intersection / union
-                if similarity >= similarity_threshold:
-                    potential_duplicates.append(candidate)
-        
-        return potential_duplicates
+        duplicate_ids = jaccard_matches(words, query.all(), similarity_threshold)
+        if not duplicate_ids:
+            return []
+        return self.session.query(Article).filter(Article.id.in_(duplicate_ids)).all()
     
     def update_article_with_history(self, article_id: int, updates: Dict[str, Any], 
                                    change_source: str = 'collection') -> Optional[Article]:
@@ -155,6 +266,44 @@ class ArticleRepository(BaseRepository[Article]):
         # Update the article
         return self.update(article_id, **updates)
     
+    def bulk_update_with_history(self, updates: List[Tuple[Article, Dict[str, Any]]],
+                                 change_source: str = 'collection') -> int:
+        """Update already-loaded articles with a single flush and record their history in one insert."""
+        now = utc_now()
+        changes = []
+        
+        for article, fields in updates:
+            for field, new_value in fields.items():
+                if not hasattr(article, field):
+                    continue
+                
+                old_value = getattr(article, field)
+                if old_value != new_value:
+                    changes.append(ChangePayload(article.id, field, old_value, new_value, change_source))
+                setattr(article, field, new_value)
+            
+            article.updated_at = now
+        
+        self.session.flush()
+        ArticleHistory.bulk_create_change_records(self.session, changes)
+        return len(updates)
+    
+    def touch_last_seen(self, article_ids: List[int], seen_at: Optional[datetime] = None) -> int:
+        """Bump last_seen for unchanged articles with a single UPDATE.
+        
+        Defaults to the database clock when no timestamp is given.
+        """
+        if not article_ids:
+            return 0
+        
+        result = self.session.execute(
+            update(Article)
+            .where(Article.id.in_(article_ids))
+            .values(last_seen=seen_at if seen_at is not None else func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
     def get_trending_articles(self, site_id: int = None, days: int = 7, 
                             limit: int = 20) -> List[Article]:
         """Get trending articles based on recent discovery and quality."""
@@ -177,46 +326,37 @@ class ArticleRepository(BaseRepository[Article]):
         ).limit(limit).all()
     
     def get_article_statistics(self, site_id: int = None) -> Dict[str, Any]:
-        """Get comprehensive article statistics."""
-        query = self.session.query(Article).filter(Article.is_deleted == False)
+        """Get comprehensive article statistics, aggregated in a single query."""
+        recent_cutoff = utc_now() - timedelta(days=7)
+        
+        query = self.session.query(
+            func.count(),
+            func.count().filter(Article.is_active == True),
+            func.count().filter(Article.is_duplicate == True),
+            func.count().filter(Article.first_seen >= recent_cutoff),
+            func.avg(Article.quality_score).filter(Article.quality_score > 0),
+            func.avg(func.nullif(Article.word_count, 0)),
+            func.count(distinct(Article.author_id)),
+            func.count(distinct(Article.category_id))
+        ).filter(Article.is_deleted == False)
         
         if site_id:
             query = query.filter(Article.site_id == site_id)
         
-        articles = query.all()
+        (total_articles, active_articles, duplicate_articles, recent_articles,
+         avg_quality, avg_word_count, unique_authors, unique_categories) = query.one()
         
-        if not articles:
+        if not total_articles:
             return {}
         
-        # Basic counts
-        total_articles = len(articles)
-        active_articles = len([a for a in articles if a.is_active])
-        duplicate_articles = len([a for a in articles if a.is_duplicate])
-        
-        # Quality metrics
-        quality_scores = [a.quality_score for a in articles if a.quality_score > 0]
-        avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
-        
-        # Content metrics
-        word_counts = [a.word_count for a in articles if a.word_count]
-        avg_word_count = sum(word_counts) / len(word_counts) if word_counts else 0
-        
-        # Time-based metrics
-        recent_articles = len([a for a in articles 
-                             if a.first_seen >= datetime.utcnow() - timedelta(days=7)])
-        
-        # Author and category diversity
-        unique_authors = len(set(a.author_id for a in articles if a.author_id))
-        unique_categories = len(set(a.category_id for a in articles if a.category_id))
-        
         return {
             'total_articles': total_articles,
             'active_articles': active_articles,
             'duplicate_articles': duplicate_articles,
             'duplicate_rate': (duplicate_articles / total_articles * 100) if total_articles > 0 else 0,
             'recent_articles_7d': recent_articles,
-            'avg_quality_score': round(avg_quality, 2),
-            'avg_word_count': round(avg_word_count, 0),
+            'avg_quality_score': round(avg_quality or 0, 2),
+            'avg_word_count': round(float(avg_word_count or 0), 0),
             'unique_authors': unique_authors,
             'unique_categories': unique_categories,
         }
@@ -225,21 +365,22 @@ class ArticleRepository(BaseRepository[Article]):
         """Get daily article publication timeline."""
         cutoff_time = datetime.utcnow() - timedelta(days=days)
         
-        articles = self.session.query(Article).filter(
+        # Stream plain column tuples instead of materializing every Article
+        rows = self.session.query(Article.first_seen, Article.word_count).filter(
             Article.site_id == site_id,
             Article.first_seen >= cutoff_time,
             Article.is_deleted == False
-        ).all()
+        ).yield_per(STREAM_BATCH_SIZE)
         
         # Group by day
         daily_counts = {}
-        for article in articles:
-            day = article.first_seen.date()
+        for first_seen, word_count in rows:
+            day = first_seen.date()
             if day not in daily_counts:
                 daily_counts[day] = {'new_articles': 0, 'total_words': 0}
             
             daily_counts[day]['new_articles'] += 1
-            daily_counts[day]['total_words'] += article.word_count or 0
+            daily_counts[day]['total_words'] += word_count or 0
         
         # Convert to list and sort
         timeline = []
@@ -274,6 +415,16 @@ class ArticleRepository(BaseRepository[Article]):
         self.session.flush()
         return article
     
+    def mark_duplicates(self, pairs: Sequence[Tuple[int, int]]) -> int:
+        """Mark many ``(duplicate_id, original_id)`` pairs at once, with history records."""
+        marked = Article.mark_duplicates(self.session, pairs)
+        ArticleHistory.bulk_create_change_records(self.session, (
+            ChangePayload(duplicate_id, 'duplicate_status', 'unique',
+                          f'duplicate_of_{original_id}', 'manual')
+            for duplicate_id, original_id in pairs
+        ))
+        return marked
+    
     def get_articles_with_relations(self, site_id: int, limit: int = 50) -> List[Article]:
         """Get articles with their related author and category data."""
         return self.session.query(Article).options(
@@ -1,10 +1,10 @@
 """Author repository for managing article authors."""
 
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
-from .base import BaseRepository
+from sqlalchemy import desc, func, select
+from .base import BaseRepository, STREAM_BATCH_SIZE
 from ..models.authors import Author
 
 
@@ -18,6 +18,11 @@ class AuthorRepository(BaseRepository[Author]):
         """Get existing author or create new one."""
         return Author.get_or_create_by_name_and_site(self.session, name, site_id, **kwargs)
     
+    def get_or_create_many(self, names: Iterable[str], site_id: int) -> Dict[str, int]:
+        """Resolve author names to IDs for a site, creating the missing ones."""
+        ids = Author.get_or_create_many(self.session, ((name, site_id) for name in names))
+        return {name: author_id for (name, _), author_id in ids.items()}
+    
     def get_authors_by_site(self, site_id: int, limit: int = 50) -> List[Author]:
         """Get authors for a specific site."""
         return self.session.query(Author).filter(
@@ -63,10 +68,15 @@ class AuthorRepository(BaseRepository[Author]):
         
         from ..models.articles import Article
         
-        # Get all articles by this author
-        articles = self.session.query(Article).filter(
-            Article.author_id == author_id,
-            Article.is_deleted == False
+        # Get all articles by this author, as plain rows of the columns used below
+        articles = self.session.execute(
+            select(
+                Article.is_active, Article.first_seen, Article.quality_score,
+                Article.word_count, Article.category_id, Article.published_at
+            ).where(
+                Article.author_id == author_id,
+                Article.is_deleted == False
+            )
         ).all()
         
         if not articles:
@@ -77,11 +87,11 @@ class AuthorRepository(BaseRepository[Author]):
             }
         
         # Calculate metrics
-        active_articles = len([a for a in articles if a.is_active])
+        active_articles = sum(1 for a in articles if a.is_active)
         
         # Recent activity (last 30 days)
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_articles = len([a for a in articles if a.first_seen >= thirty_days_ago])
+        recent_articles = sum(1 for a in articles if a.first_seen >= thirty_days_ago)
         
         # Quality metrics
         quality_scores = [a.quality_score for a in articles if a.quality_score > 0]
@@ -162,18 +172,7 @@ class AuthorRepository(BaseRepository[Author]):
     
     def bulk_update_stats(self, site_id: int = None) -> int:
         """Update statistics for all authors."""
-        query = self.session.query(Author).filter(Author.is_deleted == False)
-        
-        if site_id:
-            query = query.filter(Author.site_id == site_id)
-        
-        authors = query.all()
-        updated_count = 0
-        
-        for author in authors:
-            author.update_article_stats(self.session)
-            updated_count += 1
-        
+        updated_count = Author.refresh_stats_bulk(self.session, site_id)
         self.session.flush()
         return updated_count
     
@@ -183,17 +182,20 @@ class AuthorRepository(BaseRepository[Author]):
         
         cutoff_time = datetime.utcnow() - timedelta(days=days)
         
-        articles = self.session.query(Article).filter(
+        # Stream plain column tuples instead of materializing every Article
+        rows = self.session.query(
+            Article.first_seen, Article.word_count, Article.category_id
+        ).filter(
             Article.author_id == author_id,
             Article.first_seen >= cutoff_time,
             Article.is_deleted == False
-        ).order_by(Article.first_seen).all()
+        ).order_by(Article.first_seen).yield_per(STREAM_BATCH_SIZE)
         
         # Group by week
         weekly_counts = {}
-        for article in articles:
+        for first_seen, word_count, category_id in rows:
             # Get the start of the week (Monday)
-            week_start = article.first_seen - timedelta(days=article.first_seen.weekday())
+            week_start = first_seen - timedelta(days=first_seen.weekday())
             week_key = week_start.date()
             
             if week_key not in weekly_counts:
@@ -204,9 +206,9 @@ class AuthorRepository(BaseRepository[Author]):
                 }
             
             weekly_counts[week_key]['articles'] += 1
-            weekly_counts[week_key]['total_words'] += article.word_count or 0
-            if article.category_id:
-                weekly_counts[week_key]['categories'].add(article.category_id)
+            weekly_counts[week_key]['total_words'] += word_count or 0
+            if category_id:
+                weekly_counts[week_key]['categories'].add(category_id)
         
         # Convert to timeline format
         timeline = []
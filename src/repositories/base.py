@@ -7,6 +7,9 @@ from datetime import datetime
 
 T = TypeVar('T')
 
+# Rows buffered per round-trip when streaming large result sets with yield_per
+STREAM_BATCH_SIZE = 1000
+
 
 class BaseRepository(Generic[T]):
     """Base repository class with common CRUD operations."""
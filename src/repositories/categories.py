@@ -1,10 +1,10 @@
 """Category repository for managing article categories."""
 
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
-from .base import BaseRepository
+from sqlalchemy import desc, func, select
+from .base import BaseRepository, STREAM_BATCH_SIZE
 from ..models.categories import Category
 
 
@@ -18,6 +18,11 @@ class CategoryRepository(BaseRepository[Category]):
         """Get existing category or create new one."""
         return Category.get_or_create_by_name_and_site(self.session, name, site_id, **kwargs)
     
+    def get_or_create_many(self, names: Iterable[str], site_id: int) -> Dict[str, int]:
+        """Resolve category names to IDs for a site, creating the missing ones."""
+        ids = Category.get_or_create_many(self.session, ((name, site_id) for name in names))
+        return {name: category_id for (name, _), category_id in ids.items()}
+    
     def get_categories_by_site(self, site_id: int, active_only: bool = True) -> List[Category]:
         """Get categories for a specific site."""
         query = self.session.query(Category).filter(
@@ -135,10 +140,15 @@ class CategoryRepository(BaseRepository[Category]):
         
         from ..models.articles import Article
         
-        # Get articles in this category
-        articles = self.session.query(Article).filter(
-            Article.category_id == category_id,
-            Article.is_deleted == False
+        # Get articles in this category, as plain rows of the columns used below
+        articles = self.session.execute(
+            select(
+                Article.is_active, Article.first_seen, Article.quality_score,
+                Article.word_count, Article.author_id, Article.published_at
+            ).where(
+                Article.category_id == category_id,
+                Article.is_deleted == False
+            )
         ).all()
         
         if not articles:
@@ -150,7 +160,7 @@ class CategoryRepository(BaseRepository[Category]):
         
         # Recent activity
         cutoff_time = datetime.utcnow() - timedelta(days=days)
-        recent_articles = len([a for a in articles if a.first_seen >= cutoff_time])
+        recent_articles = sum(1 for a in articles if a.first_seen >= cutoff_time)
         
         # Quality metrics
         quality_scores = [a.quality_score for a in articles if a.quality_score > 0]
@@ -181,7 +191,7 @@ class CategoryRepository(BaseRepository[Category]):
             'level': category.level,
             'hierarchy_path': category.hierarchy_path,
             'total_articles': len(articles),
-            'active_articles': len([a for a in articles if a.is_active]),
+            'active_articles': sum(1 for a in articles if a.is_active),
             'recent_articles': recent_articles,
             'trending_score': category.trending_score,
             'avg_quality_score': round(avg_quality, 2),
@@ -207,19 +217,7 @@ class CategoryRepository(BaseRepository[Category]):
     
     def bulk_update_stats(self, site_id: int = None) -> int:
         """Update statistics for all categories."""
-        query = self.session.query(Category).filter(Category.is_deleted == False)
-        
-        if site_id:
-            query = query.filter(Category.site_id == site_id)
-        
-        categories = query.all()
-        updated_count = 0
-        
-        for category in categories:
-            category.update_article_stats(self.session)
-            category.calculate_trending_score(self.session)
-            updated_count += 1
-        
+        updated_count = Category.refresh_stats_bulk(self.session, site_id)
         self.session.flush()
         return updated_count
     
@@ -229,16 +227,19 @@ class CategoryRepository(BaseRepository[Category]):
         
         cutoff_time = datetime.utcnow() - timedelta(days=days)
         
-        articles = self.session.query(Article).filter(
+        # Stream plain column tuples instead of materializing every Article
+        rows = self.session.query(
+            Article.first_seen, Article.word_count, Article.author_id
+        ).filter(
             Article.category_id == category_id,
             Article.first_seen >= cutoff_time,
             Article.is_deleted == False
-        ).order_by(Article.first_seen).all()
+        ).order_by(Article.first_seen).yield_per(STREAM_BATCH_SIZE)
         
         # Group by day
         daily_counts = {}
-        for article in articles:
-            day = article.first_seen.date()
+        for first_seen, word_count, author_id in rows:
+            day = first_seen.date()
             if day not in daily_counts:
                 daily_counts[day] = {
                     'articles': 0, 
@@ -247,9 +248,9 @@ class CategoryRepository(BaseRepository[Category]):
                 }
             
             daily_counts[day]['articles'] += 1
-            daily_counts[day]['total_words'] += article.word_count or 0
-            if article.author_id:
-                daily_counts[day]['authors'].add(article.author_id)
+            daily_counts[day]['total_words'] += word_count or 0
+            if author_id:
+                daily_counts[day]['authors'].add(author_id)
         
         # Convert to timeline format
         timeline = []
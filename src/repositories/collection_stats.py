@@ -21,6 +21,13 @@ class CollectionStatsRepository(BaseRepository[CollectionStats]):
             self.session, site_id, period_start, period_end, period_type
         )
     
+    def create_period_stats_bulk(self, site_ids: List[int], period_start: datetime,
+                                 period_end: datetime, period_type: str) -> List[int]:
+        """Create statistics for many sites at once, returning the new row IDs."""
+        return CollectionStats.create_period_stats_bulk(
+            self.session, site_ids, period_start, period_end, period_type
+        )
+    
     def get_latest_stats(self, site_id: int, period_type: str, 
                         limit: int = 10) -> List[CollectionStats]:
         """Get the most recent statistics for a site and period type."""
@@ -30,6 +37,14 @@ class CollectionStatsRepository(BaseRepository[CollectionStats]):
         """Get a summary of statistics for the last N days."""
         return CollectionStats.get_stats_summary(self.session, site_id, days)
     
+    def refresh_summary_view(self) -> None:
+        """Refresh the materialized 7-day summary served by get_stats_summary."""
+        CollectionStats.refresh_summary_view(self.session)
+    
+    def ensure_partitions(self, months_ahead: int = 3) -> None:
+        """Create the monthly collection_stats partitions that do not exist yet."""
+        CollectionStats.ensure_partitions(self.session, months_ahead)
+    
     def get_stats_by_period(self, site_id: int, period_type: str, 
                            start_date: datetime = None, end_date: datetime = None) -> List[CollectionStats]:
         """Get statistics for a specific time range."""
@@ -116,13 +131,18 @@ class CollectionStatsRepository(BaseRepository[CollectionStats]):
                 comparison[site_id] = {'error': 'No data available'}
                 continue
             
-            # Aggregate metrics
-            total_requests = sum(s.total_requests for s in stats)
-            total_successful = sum(s.successful_requests for s in stats)
-            total_articles = sum(s.new_articles_created for s in stats)
-            
-            response_times = [s.avg_response_time_ms for s in stats if s.avg_response_time_ms]
-            quality_scores = [s.data_quality_score for s in stats if s.data_quality_score]
+            # Aggregate metrics in a single pass over the periods
+            total_requests = total_successful = total_articles = 0
+            response_times = []
+            quality_scores = []
+            for s in stats:
+                total_requests += s.total_requests
+                total_successful += s.successful_requests
+                total_articles += s.new_articles_created
+                if s.avg_response_time_ms:
+                    response_times.append(s.avg_response_time_ms)
+                if s.data_quality_score:
+                    quality_scores.append(s.data_quality_score)
             
             comparison[site_id] = {
                 'total_requests': total_requests,
@@ -231,6 +251,10 @@ class CollectionStatsRepository(BaseRepository[CollectionStats]):
             'avg_retries_per_day': total_retries / len(stats) if stats else 0,
         }
     
+    def recompute_error_rates(self, since: datetime, site_id: int = None) -> int:
+        """Recalculate error rates for all periods since a date with a single UPDATE."""
+        return CollectionStats.recompute_error_rates(self.session, since, site_id)
+    
     def cleanup_old_stats(self, days_to_keep: int = 365) -> int:
         """Clean up old statistics, keeping only recent ones."""
         cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
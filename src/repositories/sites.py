@@ -34,7 +34,7 @@ class SiteRepository(BaseRepository[Site]):
     def get_unhealthy_sites(self) -> List[Site]:
         """Get sites with high error counts."""
         return self.session.query(Site).filter(
-            Site.collection_error_count >= 5,
+            ~Site.is_healthy,
             Site.is_active == True,
             Site.is_deleted == False
         ).all()
@@ -114,16 +114,17 @@ class SiteRepository(BaseRepository[Site]):
             Snapshot.timestamp >= week_ago
         ).count()
         
-        # Success rate (last 100 snapshots)
-        recent_snapshots_query = self.session.query(Snapshot).filter(
+        # Success rate (last 100 snapshots), weighted by the requests each one stands for
+        recent_snapshots_query = self.session.query(Snapshot.is_successful, Snapshot.hit_count).filter(
             Snapshot.site_id == site.id
         ).order_by(Snapshot.timestamp.desc()).limit(100)
         
-        successful_snapshots = sum(
-            1 for s in recent_snapshots_query if s.is_successful
-        )
-        total_recent = recent_snapshots_query.count()
-        success_rate = (successful_snapshots / total_recent * 100) if total_recent > 0 else 0
+        successful_requests = total_recent = 0
+        for is_successful, hit_count in recent_snapshots_query:
+            total_recent += hit_count
+            if is_successful:
+                successful_requests += hit_count
+        success_rate = (successful_requests / total_recent * 100) if total_recent > 0 else 0
         
         return {
             'site_name': site.name,
@@ -3,10 +3,18 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
-from .base import BaseRepository
+from sqlalchemy import desc, asc, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from .base import BaseRepository, STREAM_BATCH_SIZE
 from ..models.snapshots import Snapshot
 
+# Built once so each call only binds parameters; the statement's cache key is
+# memoized and the engine's compiled cache serves the SQL string on every poll
+_UPSERT_BY_CONTENT_HASH = pg_insert(Snapshot).on_conflict_do_update(
+    index_elements=['site_id', 'content_hash'],
+    set_={'last_seen': func.now(), 'hit_count': Snapshot.hit_count + 1}
+).returning(Snapshot.id)
+
 
 class SnapshotRepository(BaseRepository[Snapshot]):
     """Repository for Snapshot model operations."""
@@ -21,10 +29,30 @@ class SnapshotRepository(BaseRepository[Snapshot]):
             site_id=site_id,
             endpoint=endpoint,
             response_status=response_status,
-            raw_data=raw_data,
+            raw_compressed=Snapshot.compress_raw_data(raw_data),
             **kwargs
         )
     
+    def upsert_by_content_hash(self, **kwargs) -> int:
+        """Insert a snapshot, or only bump last_seen/hit_count if identical content was already stored.
+        
+        Snapshots without a content_hash (e.g. failed requests) are always inserted.
+        Returns the snapshot ID.
+        """
+        return self.session.execute(_UPSERT_BY_CONTENT_HASH, kwargs).scalar_one()
+    
+    def record_repeated_error(self, snapshot_id: int) -> None:
+        """Count another occurrence of an error already stored as a snapshot."""
+        self.session.execute(
+            update(Snapshot)
+            .where(Snapshot.id == snapshot_id)
+            .values(
+                retry_count=Snapshot.retry_count + 1,
+                hit_count=Snapshot.hit_count + 1,
+                last_seen=func.now()
+            )
+        )
+    
     def get_latest_successful(self, site_id: int, endpoint: str) -> Optional[Snapshot]:
         """Get the most recent successful snapshot for a site/endpoint."""
         return Snapshot.get_latest_successful_snapshot(self.session, site_id, endpoint)
@@ -58,39 +86,51 @@ class SnapshotRepository(BaseRepository[Snapshot]):
         """Get performance metrics for a site."""
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
         
-        snapshots = self.session.query(Snapshot).filter(
-            Snapshot.site_id == site_id,
-            Snapshot.timestamp >= cutoff_time
+        # Plain rows of the columns used below; payloads are never loaded
+        snapshots = self.session.execute(
+            select(
+                Snapshot.response_status, Snapshot.response_time_ms, Snapshot.data_quality_score,
+                Snapshot.hit_count
+            ).where(
+                Snapshot.site_id == site_id,
+                Snapshot.timestamp >= cutoff_time
+            )
         ).all()
         
         if not snapshots:
             return {}
         
-        # Calculate metrics
-        total_requests = len(snapshots)
-        successful_requests = len([s for s in snapshots if s.is_successful])
+        # Success counts, response times, quality scores and errors in one pass;
+        # request counts are weighted by hit_count, timings are per stored response
+        total_requests = 0
+        successful_requests = 0
+        response_times = []
+        quality_scores = []
+        error_types = {}
+        for status, response_time_ms, quality_score, hit_count in snapshots:
+            total_requests += hit_count
+            if 200 <= status < 300:
+                successful_requests += hit_count
+            else:
+                error_types[status] = error_types.get(status, 0) + hit_count
+            if response_time_ms:
+                response_times.append(response_time_ms)
+            if quality_score:
+                quality_scores.append(quality_score)
         failed_requests = total_requests - successful_requests
         
         # Response time metrics
-        response_times = [s.response_time_ms for s in snapshots if s.response_time_ms]
         avg_response_time = sum(response_times) / len(response_times) if response_times else 0
         max_response_time = max(response_times) if response_times else 0
         min_response_time = min(response_times) if response_times else 0
         
         # Data quality metrics
-        quality_scores = [s.data_quality_score for s in snapshots if s.data_quality_score]
         avg_quality_score = sum(quality_scores) / len(quality_scores) if quality_scores else 0
         
-        # Error breakdown
-        error_types = {}
-        for snapshot in snapshots:
-            if not snapshot.is_successful:
-                status = snapshot.response_status
-                error_types[status] = error_types.get(status, 0) + 1
-        
         return {
             'period_hours': hours,
             'total_requests': total_requests,
+            'total_snapshots': len(snapshots),
             'successful_requests': successful_requests,
             'failed_requests': failed_requests,
             'success_rate': (successful_requests / total_requests * 100) if total_requests > 0 else 0,
@@ -105,17 +145,23 @@ class SnapshotRepository(BaseRepository[Snapshot]):
         """Get data volume statistics."""
         cutoff_time = datetime.utcnow() - timedelta(days=days)
         
-        snapshots = self.session.query(Snapshot).filter(
-            Snapshot.site_id == site_id,
-            Snapshot.timestamp >= cutoff_time,
-            Snapshot.response_status.between(200, 299)  # Only successful requests
+        snapshots = self.session.execute(
+            select(
+                Snapshot.timestamp, Snapshot.response_size_bytes, Snapshot.processed_count,
+                Snapshot.hit_count
+            ).where(
+                Snapshot.site_id == site_id,
+                Snapshot.timestamp >= cutoff_time,
+                Snapshot.response_status.between(200, 299)  # Only successful requests
+            )
         ).all()
         
         if not snapshots:
             return {}
         
-        # Volume metrics
-        total_size = sum(s.response_size_bytes or 0 for s in snapshots)
+        # Volume metrics; each row stands for hit_count identical responses
+        total_requests = sum(s.hit_count for s in snapshots)
+        total_size = sum((s.response_size_bytes or 0) * s.hit_count for s in snapshots)
         total_processed = sum(s.processed_count for s in snapshots)
         
         # Daily breakdown
@@ -125,18 +171,19 @@ class SnapshotRepository(BaseRepository[Snapshot]):
             if day not in daily_stats:
                 daily_stats[day] = {'requests': 0, 'processed_items': 0, 'total_size': 0}
             
-            daily_stats[day]['requests'] += 1
+            daily_stats[day]['requests'] += snapshot.hit_count
             daily_stats[day]['processed_items'] += snapshot.processed_count
-            daily_stats[day]['total_size'] += snapshot.response_size_bytes or 0
+            daily_stats[day]['total_size'] += (snapshot.response_size_bytes or 0) * snapshot.hit_count
         
         return {
             'period_days': days,
             'total_snapshots': len(snapshots),
+            'total_requests': total_requests,
             'total_size_bytes': total_size,
             'total_size_mb': round(total_size / (1024 * 1024), 2),
             'total_processed_items': total_processed,
             'avg_items_per_request': round(total_processed / len(snapshots), 2),
-            'avg_size_per_request': round(total_size / len(snapshots), 2),
+            'avg_size_per_request': round(total_size / total_requests, 2),
             'daily_breakdown': {str(k): v for k, v in daily_stats.items()}
         }
     
@@ -164,6 +211,14 @@ class SnapshotRepository(BaseRepository[Snapshot]):
         """Mark snapshot as processed with item count."""
         return self.update(snapshot_id, processed_count=processed_count)
     
+    def set_data_quality_score(self, snapshot_id: int, data_quality_score: float) -> None:
+        """Store an already computed quality score without loading the snapshot."""
+        self.session.execute(
+            update(Snapshot)
+            .where(Snapshot.id == snapshot_id)
+            .values(data_quality_score=data_quality_score)
+        )
+    
     def update_quality_score(self, snapshot_id: int) -> Optional[Snapshot]:
         """Update the quality score for a snapshot."""
         snapshot = self.get_by_id(snapshot_id)
@@ -176,25 +231,38 @@ class SnapshotRepository(BaseRepository[Snapshot]):
         self.session.flush()
         return snapshot
     
+    def rescore_quality(self, since: datetime = None) -> int:
+        """Recompute quality scores for all snapshots since a date in vectorized batches."""
+        return Snapshot.rescore_quality(self.session, since, batch_size=STREAM_BATCH_SIZE)
+    
     def get_collection_timeline(self, site_id: int, days: int = 7) -> List[Dict[str, Any]]:
         """Get a timeline of collections for visualization."""
         cutoff_time = datetime.utcnow() - timedelta(days=days)
         
-        snapshots = self.session.query(Snapshot).filter(
+        # Stream plain column tuples; the compressed payloads are never read
+        rows = self.session.query(
+            Snapshot.timestamp, Snapshot.endpoint, Snapshot.response_status,
+            Snapshot.response_time_ms, Snapshot.processed_count, Snapshot.data_quality_score,
+            Snapshot.hit_count, Snapshot.last_seen
+        ).filter(
             Snapshot.site_id == site_id,
             Snapshot.timestamp >= cutoff_time
-        ).order_by(asc(Snapshot.timestamp)).all()
+        ).order_by(asc(Snapshot.timestamp)).yield_per(STREAM_BATCH_SIZE)
         
         timeline = []
-        for snapshot in snapshots:
+        for (timestamp, endpoint, status, response_time_ms, processed_count, quality_score,
+             hit_count, last_seen) in rows:
             timeline.append({
-                'timestamp': snapshot.timestamp.isoformat(),
-                'endpoint': snapshot.endpoint,
-                'status': snapshot.response_status,
-                'success': snapshot.is_successful,
-                'response_time_ms': snapshot.response_time_ms,
-                'processed_count': snapshot.processed_count,
-                'quality_score': snapshot.data_quality_score,
+                'timestamp': timestamp.isoformat(),
+                'endpoint': endpoint,
+                'status': status,
+                'success': 200 <= status < 300,
+                'response_time_ms': response_time_ms,
+                'processed_count': processed_count,
+                'quality_score': quality_score,
+                # Identical polls collapse into one entry; hit_count says how many
+                'hit_count': hit_count,
+                'last_seen': last_seen.isoformat() if last_seen else None,
             })
         
         return timeline
\ No newline at end of file
@@ -1,7 +1,9 @@
 """HTTP client utilities with retry logic and rate limiting."""
 
 import time
+import threading
 from typing import Optional, Dict, Any
+import orjson
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
@@ -10,33 +12,73 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def _build_session(pool_connections: int = 10, pool_maxsize: int = 10) -> requests.Session:
+    """Create a session with retry strategy, connection pooling and default headers."""
+    session = requests.Session()
+    
+    retry_strategy = Retry(
+        total=settings.api.max_retries,
+        backoff_factor=settings.api.backoff_factor,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry_strategy
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    
+    # Set default headers
+    session.headers.update({
+        'User-Agent': 'Termometro-Tecnologia/0.1.0 (+https://github.com/lucianfialho/tecdata)',
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """Process-wide session, so keep-alive connections survive across collectors."""
+    global _shared_session
+    
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                # Larger pool so concurrent collectors do not discard connections
+                _shared_session = _build_session(pool_maxsize=20)
+    
+    return _shared_session
+
+
+def close_shared_session() -> None:
+    """Close the process-wide session and its pooled connections."""
+    global _shared_session
+    
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
+
 
 class HTTPClient:
-    """HTTP client with retry logic and rate limiting."""
+    """HTTP client with retry logic and rate limiting.
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.last_request_time = 0
-        self._setup_session()
+    Pass ``session`` to share a connection pool (see ``get_shared_session``);
+    a shared session is left open by ``close()``.
+    """
     
-    def _setup_session(self):
-        """Setup session with retry strategy."""
-        retry_strategy = Retry(
-            total=settings.api.max_retries,
-            backoff_factor=settings.api.backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        
-        # Set default headers
-        self.session.headers.update({
-            'User-Agent': 'Termometro-Tecnologia/0.1.0 (+https://github.com/lucianfialho/tecdata)',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate',
-        })
+    def __init__(self, session: Optional[requests.Session] = None):
+        self._owns_session = session is None
+        self.session = session if session is not None else _build_session()
+        self.last_request_time = 0
     
     def _apply_rate_limit(self):
         """Apply rate limiting between requests."""
@@ -46,7 +88,7 @@ class HTTPClient:
         
         if time_since_last < min_interval:
             sleep_time = min_interval - time_since_last
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
+            logger.debug("Rate limiting: sleeping for {:.2f} seconds", sleep_time)
             time.sleep(sleep_time)
         
         self.last_request_time = time.time()
@@ -65,7 +107,7 @@ class HTTPClient:
         timeout = timeout or settings.api.request_timeout
         
         try:
-            logger.debug(f"Making GET request to: {url}")
+            logger.debug("Making GET request to: {}", url)
             response = self.session.get(
                 url,
                 params=params,
@@ -73,7 +115,7 @@ class HTTPClient:
                 timeout=timeout
             )
             
-            logger.debug(f"Response status: {response.status_code}")
+            logger.debug("Response status: {}", response.status_code)
             response.raise_for_status()
             
             return response
@@ -94,15 +136,16 @@ class HTTPClient:
         response = self.get(url, params, headers, timeout)
         
         try:
-            return response.json()
-        except ValueError as e:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
-            logger.debug(f"Response content: {response.text[:500]}...")
+            logger.opt(lazy=True).debug("Response content: {}...", lambda: response.text[:500])
             raise
     
     def close(self):
-        """Close the session."""
-        self.session.close()
+        """Close the session, unless it is shared with other clients."""
+        if self._owns_session:
+            self.session.close()
     
     def __enter__(self):
         return self
@@ -209,7 +209,7 @@ def test_full_parsing_workflow():
         data = response.json()
         
         # Test the full parse_response method
-        articles = collector.parse_response(data)
+        articles = list(collector.parse_response(data))
         
         logger.info(f"✅ Full parsing workflow completed")
         logger.info(f"Articles parsed: {len(articles)}")
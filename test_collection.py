@@ -84,7 +84,7 @@ def test_parsing_logic():
         data = response.json()
         
         # Test parsing
-        articles = collector.parse_response(data)
+        articles = list(collector.parse_response(data))
         
         logger.info(f"Total articles parsed: {len(articles)}")
         
@@ -246,7 +246,7 @@ def analyze_database_state():
                     logger.info(f"  Avg Response Time: {avg_response_time:.0f}ms")
                 
                 # Sample recent articles
-                recent_articles = article_repo.get_recent_articles(site.id, hours=24, limit=5)
+                recent_articles = article_repo.get_recent_articles(site.id, hours=24, limit=5, with_relations=True)
                 if recent_articles:
                     logger.info(f"\n🔍 Sample Recent Articles:")
                     for i, article in enumerate(recent_articles, 1):
@@ -0,0 +1,52 @@
+"""Tests for the duplicate-title prefilter and Jaccard scoring."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from src.repositories.articles import duplicate_probe, jaccard_matches
+
+VOCABULARY = ["de", "a", "o", "apple", "lança", "novo", "iphone", "chip", "samsung", "galaxy",
+              "review", "preço", "brasil", "android", "atualização", "bateria"]
+
+
+def exhaustive_matches(words, candidates, threshold):
+    """The original full-scan Jaccard loop."""
+    matches = []
+    for candidate_id, tokens in candidates:
+        candidate_words = set(tokens) - {''}
+        union = len(words | candidate_words)
+        if union > 0 and len(words & candidate_words) / union >= threshold:
+            matches.append(candidate_id)
+    return matches
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.3, 0.5, 0.7, 0.8, 1.0])
+def test_prefilter_keeps_every_exhaustive_match(threshold):
+    """Survivors of the overlap prefilter scored exactly equal the old full scan."""
+    rng = random.Random(42)
+    for _ in range(200):
+        words = set(rng.sample(VOCABULARY, rng.randint(0, 10)))
+        # Repeated words, and the '' Postgres yields for leading/trailing whitespace
+        candidates = [(i, [""] * rng.randint(0, 1) + rng.choices(VOCABULARY, k=rng.randint(0, 10)))
+                      for i in range(30)]
+        
+        probe = duplicate_probe(words, threshold)
+        survivors = [
+            (candidate_id, tokens) for candidate_id, tokens in candidates
+            if probe is None or set(probe) & set(tokens)
+        ]
+        
+        assert jaccard_matches(words, survivors, threshold) == exhaustive_matches(words, candidates, threshold)
+
+
+def test_probe_size_follows_threshold():
+    """Ten words at 0.7 need seven shared, so any four of them is a complete probe."""
+    words = {f"word{i:02d}" for i in range(10)}
+    assert len(duplicate_probe(words, 0.7)) == 4
+    assert duplicate_probe(words, 0.0) is None
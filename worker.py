@@ -8,13 +8,17 @@ import signal
 from datetime import datetime, timedelta
 from pathlib import Path
 import time
+from contextlib import ExitStack
 
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.utils.logger import get_logger
 from src.utils.database import DatabaseManager
+from src.utils.http_client import close_shared_session
+from src.collectors.base import collect_concurrently
 from src.collectors.tecmundo import TecmundoCollector
+from src.repositories.collection_stats import CollectionStatsRepository
 from config.settings import settings
 
 # Initialize logger
@@ -49,7 +53,7 @@ class CollectionWorker:
         
         return elapsed >= interval
     
-    def run_collection(self) -> bool:
+    async def run_collection(self) -> bool:
         """Run a single data collection cycle."""
         try:
             logger.info("Starting data collection cycle")
@@ -65,40 +69,70 @@ class CollectionWorker:
             except Exception as e:
                 logger.warning(f"Database initialization warning: {e}")
             
-            # Run Tecmundo collection
-            with TecmundoCollector() as collector:
-                success = collector.collect_data()
-                metrics = collector.get_collection_metrics()
+            self.ensure_stats_partitions()
+            
+            # Run every site collection concurrently
+            with ExitStack() as stack:
+                collectors = [stack.enter_context(TecmundoCollector())]
+                results = await collect_concurrently(collectors)
                 
-                if success and metrics:
-                    logger.info("✓ Collection completed successfully")
-                    logger.info(f"  Articles found: {metrics.articles_found}")
-                    logger.info(f"  Articles new: {metrics.articles_new}")
-                    logger.info(f"  Articles updated: {metrics.articles_updated}")
-                    logger.info(f"  Articles skipped: {metrics.articles_skipped}")
-                    logger.info(f"  Response time: {metrics.response_time_ms}ms")
-                    logger.info(f"  Duration: {metrics.duration_seconds():.2f}s")
-                    
-                    self.last_collection = datetime.utcnow()
-                    self.collection_count += 1
-                    
-                    if metrics.errors:
-                        logger.warning(f"  Collection had {len(metrics.errors)} errors")
-                        for error in metrics.errors[:3]:  # Log first 3 errors
-                            logger.warning(f"    - {error}")
-                    
-                    return True
-                else:
-                    logger.error("✗ Collection failed")
-                    if metrics and metrics.errors:
-                        for error in metrics.errors:
-                            logger.error(f"  Error: {error}")
-                    return False
+                all_succeeded = True
+                for collector, success in zip(collectors, results):
+                    if not self._report_collection(collector, success):
+                        all_succeeded = False
+            
+            if all_succeeded:
+                self.last_collection = datetime.utcnow()
+                self.collection_count += 1
+            
+            return all_succeeded
                     
         except Exception as e:
             logger.error(f"Collection cycle failed: {e}")
             return False
     
+    def _report_collection(self, collector, success: bool) -> bool:
+        """Log the outcome of one collector run."""
+        metrics = collector.get_collection_metrics()
+        
+        if success and metrics:
+            logger.info(f"✓ Collection completed successfully for {collector.site_id}")
+            logger.info(f"  Articles found: {metrics.articles_found}")
+            logger.info(f"  Articles new: {metrics.articles_new}")
+            logger.info(f"  Articles updated: {metrics.articles_updated}")
+            logger.info(f"  Articles skipped: {metrics.articles_skipped}")
+            logger.info(f"  Response time: {metrics.response_time_ms}ms")
+            logger.info(f"  Duration: {metrics.duration_seconds():.2f}s")
+            
+            if metrics.errors:
+                logger.warning(f"  Collection had {len(metrics.errors)} errors")
+                for error in metrics.errors[:3]:  # Log first 3 errors
+                    logger.warning(f"    - {error}")
+            
+            return True
+        else:
+            logger.error(f"✗ Collection failed for {collector.site_id}")
+            if metrics and metrics.errors:
+                for error in metrics.errors:
+                    logger.error(f"  Error: {error}")
+            return False
+    
+    def ensure_stats_partitions(self) -> None:
+        """Make sure collection_stats has partitions for the coming months."""
+        try:
+            with DatabaseManager.get_session() as session:
+                CollectionStatsRepository(session).ensure_partitions()
+        except Exception as e:
+            logger.warning(f"Stats partition maintenance failed: {e}")
+    
+    def refresh_stats_summary(self) -> None:
+        """Refresh the dashboard's pre-aggregated stats summary."""
+        try:
+            with DatabaseManager.get_session() as session:
+                CollectionStatsRepository(session).refresh_summary_view()
+        except Exception as e:
+            logger.warning(f"Stats summary refresh failed: {e}")
+    
     def get_next_collection_time(self) -> datetime:
         """Get the next scheduled collection time."""
         if self.last_collection is None:
@@ -116,7 +150,7 @@ class CollectionWorker:
         # Run initial collection if database is ready
         logger.info("Running initial collection check...")
         if self.should_collect():
-            self.run_collection()
+            await self.run_collection()
         else:
             logger.info("Skipping initial collection - too soon since last run")
         
@@ -124,7 +158,7 @@ class CollectionWorker:
             try:
                 if self.should_collect():
                     logger.info(f"Collection #{self.collection_count + 1} starting...")
-                    success = self.run_collection()
+                    success = await self.run_collection()
                     
                     if success:
                         logger.info(f"Collection #{self.collection_count} completed successfully")
@@ -140,6 +174,9 @@ class CollectionWorker:
                         minutes = int((time_until_next.total_seconds() % 3600) // 60)
                         logger.info(f"Next collection in {hours}h {minutes}m (at {next_collection.strftime('%H:%M:%S')})")
                 
+                # Keep the summary view at most one check interval stale
+                self.refresh_stats_summary()
+                
                 # Sleep for 5 minutes between checks
                 await asyncio.sleep(300)  # 5 minutes
                 
@@ -184,6 +221,7 @@ async def main():
         logger.error(f"Worker crashed: {e}")
         sys.exit(1)
     finally:
+        close_shared_session()
         logger.info("Worker shutdown complete")
 
 